@@ -25,10 +25,8 @@ def backfill_funding():
                 logger.warning(f"Market not found for {symbol}")
                 continue
                 
-            count = 0
-            for record in history:
-                db.insert_funding_rate(market_id, record)
-                count += 1
+            # 整批寫入（一次 round-trip），略過無 funding_rate 的紀錄
+            count = db.insert_funding_rate_batch(market_id, history)
             
             logger.success(f"Backfilled {count} records for {symbol}")
             
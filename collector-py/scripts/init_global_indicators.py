@@ -57,14 +57,7 @@ def collect_fear_greed(db_loader):
             logger.warning("⚠️ No Fear & Greed history fetched")
             return 0
         
-        count = 0
-        for data in history_data:
-            try:
-                db_loader.insert_fear_greed_index(data)
-                count += 1
-            except Exception as e:
-                logger.error(f"Failed to insert record {data['timestamp']}: {e}")
-                
+        count = db_loader.insert_fear_greed_index_batch(history_data)
         logger.success(f"✅ Fear & Greed: Inserted {count} historical records")
         return count
     except Exception as e:
@@ -0,0 +1,65 @@
+"""
+HTTP 共用工具（供 requests 型 collector 使用）
+"""
+import json
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # 429 / 5xx / 連線中斷交由 transport 層指數退避重試（尊重 Retry-After）
+    retry = Retry(
+        total=3,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    取得行程內共用的 requests.Session：各 collector 共享連線池與 TLS session，
+    排程重複執行時不必重建。不在 session 上放各 API 專屬的 header（例如 API key），
+    請於每次請求時以 headers= 傳入。
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def loads_json(content: bytes) -> Any:
+    """
+    解析 HTTP 回應 body：有 orjson 時走 C 實作，直接吃 bytes 不必先解碼成 str；
+    否則退回標準庫 json。兩者的解析錯誤皆為 ValueError 子類別。
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_json(obj: Any) -> str:
+    """序列化為 JSON 字串（寫入 jsonb 欄位用）：有 orjson 時走 C 實作"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
@@ -41,7 +41,7 @@ class BitInfoChartsClient:
         )
 
         # curl_cffi
-        self.curl_impersonate = os.getenv("BITINFO_CURL_IMPERSONATE", "chrome110")
+        self.curl_impersonate = os.getenv("BITINFO_CURL_IMPERSONATE", "chrome124")
         self.session = Session(impersonate=self.curl_impersonate)
 
         # Hybrid identity cache (optional)
@@ -307,7 +307,11 @@ class BitInfoChartsClient:
     @staticmethod
     def _extract_last_updated_text(html: str) -> Optional[str]:
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            # 標記不在原始 HTML 中時，解析後的文字節點也不會有，直接略過建樹
+            if "last updated" not in html.lower():
+                return None
+            # lxml（libxml2）後端比純 Python 的 html.parser 快數倍
+            soup = BeautifulSoup(html, "lxml")
             tokens = [t.strip() for t in soup.stripped_strings if t.strip()]
             for idx, token in enumerate(tokens):
                 if "last updated" not in token.lower():
@@ -409,7 +413,8 @@ class BitInfoChartsClient:
 
     def _select_distribution_table(self, html: str) -> Optional[pd.DataFrame]:
         try:
-            dfs = pd.read_html(StringIO(html))
+            # 固定 lxml：表格轉 DataFrame 全在 libxml2 完成，不會退回 bs4/html5lib 逐格解析
+            dfs = pd.read_html(StringIO(html), flavor="lxml")
         except ValueError:
             return None
         if not dfs:
@@ -514,21 +519,29 @@ class BitInfoChartsClient:
         usd_col = next((col_map[c] for c in col_map if ("usd" in c) or ("$" in c)), None)
         pct_col = next((col_map[c] for c in col_map if "%" in c), None)
 
+        # 整頁只需解析一次（原本每列重建一次 BeautifulSoup）
+        source_last_updated = self._extract_last_updated_text(html)
+        # itertuples 以位置取值，避免 iterrows 每列建立一個 Series
+        col_pos = list(df.columns).index
+        balance_i, address_i, btc_i = col_pos(balance_col), col_pos(address_col), col_pos(btc_col)
+        usd_i = col_pos(usd_col) if usd_col is not None else None
+        pct_i = col_pos(pct_col) if pct_col is not None else None
+
         rows: List[Dict] = []
-        for _, row in df.iterrows():
-            tier = str(row.get(balance_col, "")).strip()
+        for row in df.itertuples(index=False, name=None):
+            tier = str(row[balance_i]).strip()
             if not tier or "balance" in tier.lower() or "total" in tier.lower():
                 continue
             # 避免誤選 top addresses 類表：tier 若包含 $，幾乎可判定不是 range
             if "$" in tier:
                 continue
 
-            addr_raw = str(row.get(address_col, "")).strip()
+            addr_raw = str(row[address_i]).strip()
             address_count = self._parse_int_count(addr_raw)
             if address_count is None:
                 continue
 
-            btc_raw = str(row.get(btc_col, "")).strip()
+            btc_raw = str(row[btc_i]).strip()
             # e.g. "4,200,000 BTC" -> take first token
             btc_token = btc_raw.split()[0] if btc_raw else ""
             total_balance = self._parse_number(btc_token)
@@ -539,13 +552,13 @@ class BitInfoChartsClient:
                 continue
 
             usd_amount = 0.0
-            if usd_col is not None:
-                usd_raw = str(row.get(usd_col, "")).strip()
+            if usd_i is not None:
+                usd_raw = str(row[usd_i]).strip()
                 usd_amount = float(self._parse_number(usd_raw) or 0.0)
 
             pct_supply = 0.0
-            if pct_col is not None:
-                pct_raw = str(row.get(pct_col, "")).strip()
+            if pct_i is not None:
+                pct_raw = str(row[pct_i]).strip()
                 pct_token = pct_raw.split("%")[0] if "%" in pct_raw else pct_raw
                 pct_supply = float(self._parse_number(pct_token) or 0.0)
 
@@ -558,7 +571,7 @@ class BitInfoChartsClient:
                     "percentage_of_supply": float(pct_supply),
                     "symbol": "BTC",
                     "source_url": self.base_url,
-                    "source_last_updated": self._extract_last_updated_text(html),
+                    "source_last_updated": source_last_updated,
                     "schema_fingerprint": schema_fingerprint,
                     "fetch_method": self.last_fetch_method,
                 }
@@ -5,12 +5,15 @@ CoinMarketCal API Collector
 
 import os
 import logging
-import json
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import requests
 from psycopg2.extras import execute_values
 
+from connectors._http import dumps_json, get_session, loads_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +28,26 @@ class CoinMarketCalCollector:
         'Token swap', 'Airdrop', 'Burn', 'Halving',
         'Exchange listing', 'Partnership', 'Conference'
     ]
+    # events INSERT 欄位數：source, event_type, title, description, time, impact, coins, url, metadata
+    _INSERT_TEMPLATE = "(" + ",".join(["%s"] * 9) + ")"
+    HIGH_IMPACT_CATEGORIES = frozenset({
+        'Mainnet launch', 'Hard fork', 'Halving', 'Token swap'
+    })
+    # 類別關鍵字 -> 事件類型（依序比對，先命中者優先）
+    EVENT_TYPE_MAPPING = (
+        ('launch', 'token_launch'),
+        ('mainnet', 'mainnet_launch'),
+        ('fork', 'hard_fork'),
+        ('swap', 'token_swap'),
+        ('airdrop', 'airdrop'),
+        ('burn', 'token_burn'),
+        ('halving', 'halving'),
+        ('listing', 'exchange_listing'),
+        ('partnership', 'partnership'),
+        ('conference', 'conference'),
+    )
+    # 與逐一 `cat in name` 等價（區分大小寫的子字串比對），一次掃描完成
+    _IMPORTANT_CATEGORY_RE = re.compile('|'.join(re.escape(cat) for cat in IMPORTANT_CATEGORIES))
     
     def __init__(self, api_key: str, db_conn):
         """
@@ -36,11 +59,12 @@ class CoinMarketCalCollector:
         """
         self.api_key = api_key
         self.db_conn = db_conn
-        self.session = requests.Session()
-        self.session.headers.update({
+        # 共用連線池（含重試策略）；API key 屬於本 collector，逐次請求帶入而不放在共用 session 上
+        self.session = get_session()
+        self.headers = {
             'x-api-key': api_key,
             'Accept': 'application/json'
-        })
+        }
     
     def _determine_impact(self, votes_count: int, category: str) -> str:
         """
@@ -53,11 +77,7 @@ class CoinMarketCalCollector:
         Returns:
             'high', 'medium', or 'low'
         """
-        high_impact_categories = [
-            'Mainnet launch', 'Hard fork', 'Halving', 'Token swap'
-        ]
-        
-        if category in high_impact_categories or votes_count >= 500:
+        if category in self.HIGH_IMPACT_CATEGORIES or votes_count >= 500:
             return 'high'
         elif votes_count >= 100:
             return 'medium'
@@ -66,25 +86,16 @@ class CoinMarketCalCollector:
     
     def _classify_event_type(self, category: str) -> str:
         """分類事件類型"""
+        return self._classify_category(category)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _classify_category(category: str) -> str:
+        """類別名稱是有限集合：依 EVENT_TYPE_MAPPING 順序取第一個命中的關鍵字，結果快取"""
         category_lower = category.lower()
-        
-        type_mapping = {
-            'launch': 'token_launch',
-            'mainnet': 'mainnet_launch',
-            'fork': 'hard_fork',
-            'swap': 'token_swap',
-            'airdrop': 'airdrop',
-            'burn': 'token_burn',
-            'halving': 'halving',
-            'listing': 'exchange_listing',
-            'partnership': 'partnership',
-            'conference': 'conference'
-        }
-        
-        for key, value in type_mapping.items():
+        for key, value in CoinMarketCalCollector.EVENT_TYPE_MAPPING:
             if key in category_lower:
                 return value
-        
         return 'crypto_event'
     
     def fetch_events(self, days_ahead: int = 30, max_results: int = 100) -> List[Dict[str, Any]]:
@@ -111,23 +122,23 @@ class CoinMarketCalCollector:
         
         try:
             logger.info(f"Fetching CoinMarketCal events from {from_date.date()} to {to_date.date()}")
-            response = self.session.get(url, params=params, timeout=15)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=15)
             response.raise_for_status()
             
-            data = response.json()
+            data = loads_json(response.content)
             events = data.get('body', [])
             
             # 過濾重要事件
             important_events = [
                 e for e in events 
-                if any(cat in e.get('categories', [{}])[0].get('name', '') for cat in self.IMPORTANT_CATEGORIES)
+                if self._IMPORTANT_CATEGORY_RE.search(e.get('categories', [{}])[0].get('name', ''))
                 or e.get('vote_count', 0) >= 50
             ]
             
             logger.info(f"Fetched {len(events)} total events, {len(important_events)} important events")
             return important_events
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error fetching CoinMarketCal events: {e}")
             return []
     
@@ -148,50 +159,43 @@ class CoinMarketCalCollector:
         
         # 準備資料
         values = []
+        invalid_titles = []
         for event in events:
             title = event.get('title', {}).get('en', 'Untitled Event')
-            description = event.get('description', {}).get('en', '')
             
-            # 解析日期
-            date_event_str = event.get('date_event', '')
+            # 解析日期（CoinMarketCal 使用 ISO 8601；Python 3.11 起 fromisoformat 可直接解析 'Z'）
             try:
-                # CoinMarketCal 使用 ISO 8601 格式
-                event_date = datetime.fromisoformat(date_event_str.replace('Z', '+00:00'))
+                event_date = datetime.fromisoformat(event.get('date_event', ''))
             except (ValueError, TypeError):
-                logger.warning(f"Invalid date format for event: {title}")
+                invalid_titles.append(title)
                 continue
             
+            description = event.get('description', {}).get('en', '')
             # 提取幣種資訊
-            coins = []
-            if 'coins' in event:
-                for coin in event['coins']:
-                    symbol = coin.get('symbol', '')
-                    if symbol:
-                        coins.append(symbol.upper())
+            coins = [symbol.upper() for coin in event.get('coins') or () if (symbol := coin.get('symbol', ''))]
             
             # 分類與影響等級
             categories = event.get('categories', [])
             category_name = categories[0].get('name', '') if categories else ''
-            event_type = self._classify_event_type(category_name)
-            
-            vote_count = event.get('vote_count', 0)
-            impact = self._determine_impact(vote_count, category_name)
-            
-            # URL
-            url = f"https://coinmarketcal.com/en/event/{event.get('id', '')}"
             
             values.append((
                 'coinmarketcal',
-                event_type,
+                self._classify_event_type(category_name),
                 title,
                 description if description else None,
                 event_date,
-                impact,
+                self._determine_impact(event.get('vote_count', 0), category_name),
                 coins if coins else None,
-                url,
-                json.dumps(event)  # 轉換成 JSON 字串
+                f"https://coinmarketcal.com/en/event/{event.get('id', '')}",
+                dumps_json(event)  # 轉換成 JSON 字串（jsonb metadata）
             ))
         
+        if invalid_titles:
+            # 壞資料彙總成一筆日誌，不在迴圈內逐筆格式化
+            logger.warning(
+                f"Skipped {len(invalid_titles)} CoinMarketCal events with invalid date format: {invalid_titles[:5]}"
+            )
+        
         if not values:
             return 0
         
@@ -212,7 +216,8 @@ class CoinMarketCalCollector:
         """
         
         try:
-            execute_values(cursor, query, values)
+            # 單一 round trip 送出整批（預設 page_size=100 會拆成多次往返）
+            execute_values(cursor, query, values, template=self._INSERT_TEMPLATE, page_size=len(values))
             self.db_conn.commit()
             logger.info(f"Successfully saved {len(values)} CoinMarketCal events")
             return len(values)
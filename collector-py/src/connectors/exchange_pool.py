@@ -12,10 +12,13 @@ CCXT Exchange 連接池 - 單例模式
     bybit = pool.get_exchange('bybit', api_key='xxx', api_secret='xxx')
 """
 import ccxt
-from typing import Dict, Optional
+import time
+from typing import Dict, List, Optional
 from threading import Lock
 from loguru import logger
 
+from utils.symbol_utils import normalize_symbol
+
 
 class ExchangePool:
     """
@@ -30,6 +33,9 @@ class ExchangePool:
     
     _instance = None
     _lock = Lock()
+
+    # USDT 永續合約清單快取秒數（上架/下架頻率遠低於排程頻率）
+    PERPETUALS_TTL_SECONDS = 3600
     
     def __new__(cls):
         """單例模式實作"""
@@ -39,6 +45,7 @@ class ExchangePool:
                     cls._instance = super().__new__(cls)
                     cls._instance._exchanges = {}
                     cls._instance._init_lock = Lock()
+                    cls._instance._perpetuals_cache = {}
                     logger.info("ExchangePool initialized (Singleton)")
         return cls._instance
     
@@ -150,6 +157,44 @@ class ExchangePool:
         
         return exchange
     
+    def get_usdt_perpetuals(
+        self,
+        exchange_name: str,
+        market_type: str = 'linear',
+        ttl: float = PERPETUALS_TTL_SECONDS
+    ) -> List[str]:
+        """
+        取得 USDT 結算的永續合約 symbol 清單（交易所原生格式，例如 BTCUSDT）
+
+        篩選結果依 (exchange_name, market_type) 快取於連接池，
+        funding / open interest 等 collector 共用，TTL 內不再重掃全部 markets。
+
+        Args:
+            exchange_name: 交易所名稱
+            market_type: 市場類型
+            ttl: 快取秒數
+
+        Returns:
+            USDT 永續合約 symbol 清單
+        """
+        cache_key = f"{exchange_name.lower()}_{market_type}"
+        cached = self._perpetuals_cache.get(cache_key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < ttl:
+            return list(cached[1])
+
+        exchange = self.get_exchange(exchange_name, market_type=market_type)
+        exchange.load_markets()
+        symbols = tuple(
+            normalize_symbol(symbol)
+            for symbol, market in exchange.markets.items()
+            # 永續合約（swap / linear / inverse）且以 USDT 結算
+            if (market.get('type') == 'swap' or market.get('linear') or market.get('inverse'))
+            and market.get('quote') == 'USDT'
+        )
+        self._perpetuals_cache[cache_key] = (now, symbols)
+        return list(symbols)
+
     def get_loaded_exchanges(self) -> Dict[str, ccxt.Exchange]:
         """
         取得所有已載入的交易所實例
@@ -6,22 +6,36 @@ Farside Investors ETF Data Scraper
 2. curl_cffi 作為防故障 fallback。
 3. 使用 pandas.read_html 解析表格，降低 HTML 結構微調風險。
 4. 輸出可觀測 metadata（schema fingerprint、source last updated）。
+5. 解析一律走 lxml（libxml2），匯入時即檢查；BeautifulSoup 僅作為文字擷取的備援。
 """
 
 from typing import Dict, List, Optional, Tuple
+import asyncio
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import date, datetime, timedelta, time as dtime, timezone
+from functools import lru_cache
 import hashlib
 import json
 import os
 import re
+import tempfile
 import time as time_module
 from io import StringIO
 
 import pandas as pd
-from bs4 import BeautifulSoup
-from curl_cffi.requests import Session
+from curl_cffi import CurlHttpVersion
+from curl_cffi.requests import AsyncSession, Session
 from loguru import logger
 
+try:
+    from lxml import etree, html as lxml_html
+except ImportError as exc:  # pragma: no cover - lxml 為必要依賴
+    raise ImportError(
+        "FarsideInvestorsETFCollector requires lxml; pandas.read_html would otherwise "
+        "fall back to the much slower bs4/html5lib parser. Install it with `pip install lxml`."
+    ) from exc
+
 try:
     from zoneinfo import ZoneInfo
 except Exception:
@@ -43,9 +57,16 @@ try:
 except Exception:
     PlaywrightStealth = None
 
+try:
+    import uvloop
+except Exception:
+    uvloop = None
+
 class FarsideInvestorsETFCollector:
     """
     Farside Investors ETF 資料爬蟲
+
+    表格解析固定使用 pandas.read_html(flavor="lxml")，不會退回 bs4/html5lib。
     """
 
     BTC_PRODUCTS = {
@@ -65,10 +86,53 @@ class FarsideInvestorsETFCollector:
         'ETHA': ('BlackRock', 'iShares Ethereum Trust'),
         'ETHW': ('Bitwise', 'Bitwise Ethereum ETF'),
     }
+    _BTC_KEYS = frozenset(BTC_PRODUCTS)
+    _ETH_KEYS = frozenset(ETH_PRODUCTS)
+    # 代碼（大寫）-> (issuer, canonical code)，讓常見的精確命中只需一次 dict 查找
+    _BTC_UPPER = {code.upper(): (issuer, code) for code, (issuer, _) in BTC_PRODUCTS.items()}
+    _ETH_UPPER = {code.upper(): (issuer, code) for code, (issuer, _) in ETH_PRODUCTS.items()}
 
     BASE_URL_BTC = "https://farside.co.uk/btc/"
     BASE_URL_ETH = "https://farside.co.uk/eth/"
     MAX_UNKNOWN_CODES = 200
+    # Farside 日期欄原生格式（同 _parse_date 第一優先格式），整欄以 pandas C 路徑解析
+    PRIMARY_DATE_FORMAT = "%d %b %Y"
+    # 正常 Farside 頁面遠大於此長度，過短視為不完整
+    MIN_PAGE_CHARS = 6000
+    IDENTITY_WAIT_TIMEOUT_MS = 60000
+    IDENTITY_POLL_INTERVAL_MS = 500
+    # Playwright 抓頁：主表列數超過此值即視為渲染完成
+    PLAYWRIGHT_MIN_TABLE_ROWS = 10
+    PLAYWRIGHT_TABLE_TIMEOUT_MS = 18000
+    # Cloudflare challenge 標記都位於頁首，只掃描前段即可
+    CHALLENGE_SCAN_CHARS = 4096
+
+    _PRODUCT_CODE_RE = re.compile(r"\b([A-Z]{3,6})\b")
+    _LAST_UPDATED_RE = re.compile(r"(last\s+updated[^.;]{0,100})", re.IGNORECASE)
+    _CHALLENGE_RE = re.compile(
+        r"just a moment|challenge-platform|cf-chl|cf-browser-verification", re.IGNORECASE
+    )
+    # 同一組標記的 bytes 版本：標記皆為 ASCII，可在解碼前直接比對原始回應
+    _CHALLENGE_BYTES_RE = re.compile(_CHALLENGE_RE.pattern.encode("ascii"), re.IGNORECASE)
+    # ETF 主表：含有 "Date" 表頭儲存格的 <table>
+    _DATE_TABLE_XPATH = "//table[.//th[contains(translate(., 'DATE', 'date'), 'date')]]"
+    _DATE_RE = re.compile(
+        r"^(?:(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{4})"
+        r"|(\d{1,2})/(\d{1,2})/(\d{4})"
+        r"|(\d{4})([-/])(\d{1,2})\8(\d{1,2}))$"
+    )
+    _HAS_DIGIT_RE = re.compile(r"\d")
+    _MONTHS = {
+        **{name: idx for idx, name in enumerate(
+            ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+        )},
+        **{name: idx for idx, name in enumerate(
+            ("january", "february", "march", "april", "may", "june", "july",
+             "august", "september", "october", "november", "december"), start=1
+        )},
+    }
+    _SKIP_CODES = frozenset({"USD", "AUM", "NAV", "FLOW", "FLOWS"})
+    _SKIP_KEYWORDS = ("DATE", "FEE", "TOTAL")
 
     def __init__(
         self,
@@ -82,7 +146,8 @@ class FarsideInvestorsETFCollector:
         self.stealth_mode = self._resolve_stealth_mode()
         self.use_stealth = use_stealth and self.stealth_mode != "none"
         self.market_tz = ZoneInfo("America/New_York") if ZoneInfo else timezone.utc
-        self.last_unknown_codes: Dict[str, set] = {}
+        # asset_type -> 最近出現的未知代碼（OrderedDict 當作有上限的 LRU set）
+        self.last_unknown_codes: Dict[str, "OrderedDict[str, None]"] = defaultdict(OrderedDict)
         self.last_fetch_method: Dict[str, str] = {}
         self.current_url: Optional[str] = None
         self.playwright_executable = os.getenv("ETF_PLAYWRIGHT_EXECUTABLE", "/usr/bin/chromium")
@@ -99,9 +164,23 @@ class FarsideInvestorsETFCollector:
         )
         self.cookie_cache_ttl_sec = int(os.getenv("ETF_COOKIE_CACHE_TTL_SEC", "43200"))  # 12h
         self.playwright_headless = os.getenv("ETF_PLAYWRIGHT_HEADLESS", "1") != "0"
-        self.curl_impersonate = os.getenv("ETF_CURL_IMPERSONATE", "chrome110")
-        self.session = Session(impersonate=self.curl_impersonate)
+        self.curl_impersonate = os.getenv("ETF_CURL_IMPERSONATE", "chrome124")
+        # BTC/ETH 頁面並行抓取的執行緒數（Playwright 路徑下每個執行緒各自啟動一個 Chromium）
+        self.fetch_workers = max(1, int(os.getenv("ETF_FETCH_WORKERS", "2")))
+        # 單一常駐 Session：BTC/ETH 與所有重試共用同一條 HTTP/2 連線（TLS 只握手一次）；
+        # default_headers 保留 impersonate 的 Chrome 標頭（含 br/gzip Accept-Encoding）
+        self.session = Session(
+            impersonate=self.curl_impersonate,
+            http_version=CurlHttpVersion.V2TLS,
+            default_headers=True,
+            timeout=30,
+        )
         self._identity_cache: Optional[Dict] = None
+        self._identity_sha: Optional[str] = None
+        self._written_snapshots: set = set()
+        # 快照寫檔專用：單一 worker 保持寫入順序，也限制磁碟競爭
+        self._snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="etf-snapshot")
+        self._snapshot_futures: List = []
 
         logger.info(
             "Farside ETF Collector initialized "
@@ -167,36 +246,87 @@ class FarsideInvestorsETFCollector:
 
     def _load_identity_from_cache(self) -> Optional[Dict]:
         try:
-            if not os.path.exists(self.cookie_cache_path):
+            # 快取檔的寫入時間即為身份取得時間：過期就不必讀檔/解析 JSON
+            try:
+                age = time_module.time() - os.stat(self.cookie_cache_path).st_mtime
+            except FileNotFoundError:
+                return None
+            if age > self.cookie_cache_ttl_sec:
                 return None
             with open(self.cookie_cache_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             if not isinstance(data, dict):
                 return None
-            captured_at = data.get("captured_at")
-            if captured_at:
-                try:
-                    dt = datetime.fromisoformat(str(captured_at).replace("Z", "+00:00"))
-                    age = (datetime.now(timezone.utc) - dt).total_seconds()
-                    if age > self.cookie_cache_ttl_sec:
-                        return None
-                except Exception:
-                    pass
+            self._identity_sha = self._identity_digest(data)
             return data
         except Exception as exc:
             logger.warning(f"Failed to read identity cache: {exc}")
             return None
 
+    @staticmethod
+    def _identity_digest(identity: Dict) -> str:
+        """身份指紋只看 cookies + UA（captured_at 每次都不同，不納入）"""
+        canonical = json.dumps(
+            {"cookies": identity.get("cookies") or {}, "user_agent": identity.get("user_agent")},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _atomic_write_text(path: str, text: str) -> None:
+        """先寫入同目錄暫存檔再 os.replace，避免中途崩潰留下半截檔案"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False
+        ) as f:
+            f.write(text)
+            tmp_path = f.name
+        try:
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
     def _save_identity_cache(self, identity: Dict) -> None:
         try:
-            os.makedirs(os.path.dirname(self.cookie_cache_path) or ".", exist_ok=True)
+            digest = self._identity_digest(identity)
+            if digest == self._identity_sha and os.path.exists(self.cookie_cache_path):
+                # 內容不變免重寫，但仍要刷新 mtime：TTL 以檔案寫入時間計算
+                os.utime(self.cookie_cache_path)
+                return
             payload = dict(identity)
             payload["captured_at"] = payload.get("captured_at") or datetime.now(timezone.utc).isoformat()
-            with open(self.cookie_cache_path, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
+            self._atomic_write_text(
+                self.cookie_cache_path, json.dumps(payload, ensure_ascii=False, indent=2)
+            )
+            self._identity_sha = digest
         except Exception as exc:
             logger.warning(f"Failed to write identity cache: {exc}")
 
+    def _persist_session_cookies(self, jar) -> None:
+        """
+        把 curl_cffi 回應中新取得/更新的 cookies（如 cf_clearance）併入身份並寫回快取，
+        下次執行可直接重用，不必再過一次 Cloudflare challenge。
+        """
+        if not self.hybrid_cookie_enabled:
+            return
+        try:
+            fresh = {name: value for name, value in dict(jar).items() if name and value}
+        except Exception:
+            return
+        if not fresh:
+            return
+        identity = self._get_identity() or {"cookies": {}, "user_agent": None, "source": "curl_cffi"}
+        cookies = dict(identity.get("cookies") or {})
+        if all(cookies.get(name) == value for name, value in fresh.items()):
+            return
+        cookies.update(fresh)
+        identity = {**identity, "cookies": cookies, "captured_at": datetime.now(timezone.utc).isoformat()}
+        self._identity_cache = identity
+        self._save_identity_cache(identity)
+
     def _get_identity(self) -> Optional[Dict]:
         if self._identity_cache is not None:
             return self._identity_cache
@@ -217,18 +347,7 @@ class FarsideInvestorsETFCollector:
         try:
             logger.info(f"Acquiring Cloudflare identity via Playwright (headless={self.playwright_headless})...")
             with sync_playwright() as p:
-                launch_kwargs = {
-                    "headless": self.playwright_headless,
-                    "args": [
-                        "--no-sandbox",
-                        "--disable-dev-shm-usage",
-                        "--disable-blink-features=AutomationControlled",
-                    ],
-                }
-                if self.playwright_executable and os.path.exists(self.playwright_executable):
-                    launch_kwargs["executable_path"] = self.playwright_executable
-
-                browser = p.chromium.launch(**launch_kwargs)
+                browser = p.chromium.launch(**self._playwright_launch_kwargs())
                 context = browser.new_context()
                 page = context.new_page()
 
@@ -242,13 +361,12 @@ class FarsideInvestorsETFCollector:
                     self._apply_stealth(page, context)
 
                 page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                try:
-                    page.wait_for_selector("table", timeout=60000)
-                except PlaywrightTimeoutError:
-                    logger.warning("Playwright identity acquisition timed out waiting for table")
+                cleared = self._wait_for_identity(page, context)
+                if not cleared:
+                    logger.warning("Playwright identity acquisition timed out waiting for cf_clearance/table")
 
                 html = page.content()
-                if self._is_challenge_page(html, None):
+                if not cleared and self._is_challenge_page(html, None):
                     logger.warning("Cloudflare challenge still present; identity not acquired")
                     page.close()
                     context.close()
@@ -282,6 +400,21 @@ class FarsideInvestorsETFCollector:
             logger.warning(f"Failed to acquire identity via Playwright: {exc}")
             return None
 
+    def _wait_for_identity(self, page, context) -> bool:
+        """
+        輪詢直到拿到 cf_clearance cookie（身份已取得）或主表已渲染（未觸發 challenge），
+        不必每次都等滿整個 table 逾時。
+        """
+        deadline = time_module.monotonic() + self.IDENTITY_WAIT_TIMEOUT_MS / 1000
+        while True:
+            if any(c.get("name") == "cf_clearance" for c in context.cookies()):
+                return True
+            if page.query_selector("table") is not None:
+                return True
+            if time_module.monotonic() >= deadline:
+                return False
+            page.wait_for_timeout(self.IDENTITY_POLL_INTERVAL_MS)
+
     def _market_close_timestamp(self, flow_date: date) -> datetime:
         """將 ETF 日期對齊到美股收盤（16:00 ET）並轉為 UTC"""
         if isinstance(flow_date, datetime):
@@ -289,21 +422,17 @@ class FarsideInvestorsETFCollector:
         close_dt = datetime.combine(flow_date, dtime(16, 0), tzinfo=self.market_tz)
         return close_dt.astimezone(timezone.utc)
 
-    def _known_products(self, asset_type: str) -> set:
-        return set(self.BTC_PRODUCTS.keys()) if asset_type == 'BTC' else set(self.ETH_PRODUCTS.keys())
-
-    def _trim_unknown_codes(self, asset_type: str) -> None:
-        """限制未知代碼集合大小，避免長期佔用記憶體"""
-        codes = self.last_unknown_codes.get(asset_type)
-        if not codes or len(codes) <= self.MAX_UNKNOWN_CODES:
-            return
+    def _known_products(self, asset_type: str) -> frozenset:
+        return self._BTC_KEYS if asset_type == 'BTC' else self._ETH_KEYS
 
-        trimmed = set()
+    def _remember_unknown_codes(self, asset_type: str, codes: List[str]) -> None:
+        """記錄未知代碼，超過 MAX_UNKNOWN_CODES 時淘汰最舊者，避免長期佔用記憶體"""
+        recent = self.last_unknown_codes[asset_type]
         for code in codes:
-            trimmed.add(code)
-            if len(trimmed) >= self.MAX_UNKNOWN_CODES:
-                break
-        self.last_unknown_codes[asset_type] = trimmed
+            recent[code] = None
+            recent.move_to_end(code)
+            if len(recent) > self.MAX_UNKNOWN_CODES:
+                recent.popitem(last=False)
 
     def _record_schema_change(
         self,
@@ -317,82 +446,114 @@ class FarsideInvestorsETFCollector:
         try:
             if url is None:
                 url = self.current_url
-            snapshot_dir = os.path.join("logs", "etf_snapshots")
-            os.makedirs(snapshot_dir, exist_ok=True)
             suffix = f"{asset_type.lower()}_{date.today().isoformat()}_{reason}"
+            # 同一天同原因只需一份快照；記憶體內已寫過就不必再 stat 檔案
+            if suffix in self._written_snapshots:
+                return
+            snapshot_dir = os.path.join("logs", "etf_snapshots")
             html_path = os.path.join(snapshot_dir, f"{suffix}.html")
             meta_path = os.path.join(snapshot_dir, f"{suffix}.json")
             if os.path.exists(html_path) and os.path.exists(meta_path):
+                self._written_snapshots.add(suffix)
                 return
 
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(html or "")
-
             metadata = {
                 "asset_type": asset_type,
                 "reason": reason,
-                "product_codes": product_codes,
+                "product_codes": list(product_codes),
                 "url": url,
                 "captured_at": datetime.now(timezone.utc).isoformat()
             }
-            with open(meta_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            # 先標記避免重複送出；實際寫檔交給單一背景執行緒，不阻塞解析
+            self._written_snapshots.add(suffix)
+            self._snapshot_futures.append(
+                self._snapshot_executor.submit(self._write_snapshot, suffix, html_path, meta_path, html, metadata)
+            )
+        except Exception as e:
+            logger.error(f"Failed to write ETF schema snapshot: {e}")
 
+    def _write_snapshot(self, suffix: str, html_path: str, meta_path: str, html: str, metadata: Dict) -> None:
+        try:
+            self._atomic_write_text(html_path, html or "")
+            self._atomic_write_text(meta_path, json.dumps(metadata, ensure_ascii=False, indent=2))
             logger.warning(f"ETF schema change snapshot saved: {meta_path}")
         except Exception as e:
+            self._written_snapshots.discard(suffix)
             logger.error(f"Failed to write ETF schema snapshot: {e}")
 
-    @staticmethod
-    def _is_challenge_page(html: str, status_code: Optional[int] = None) -> bool:
+    @classmethod
+    def _is_challenge_page(cls, html: str, status_code: Optional[int] = None) -> bool:
         if status_code == 403:
             return True
-        lower = (html or "").lower()
-        indicators = [
-            "just a moment",
-            "challenge-platform",
-            "cf-chl",
-            "cf-browser-verification",
-        ]
-        return any(flag in lower for flag in indicators)
+        head = (html or "")[:cls.CHALLENGE_SCAN_CHARS]
+        return cls._CHALLENGE_RE.search(head) is not None
+
+    @classmethod
+    def _is_challenge_bytes(cls, raw: bytes) -> bool:
+        """以 bytes 檢查頁首是否為 Cloudflare challenge，免去整頁解碼"""
+        return cls._CHALLENGE_BYTES_RE.search(raw[:cls.CHALLENGE_SCAN_CHARS]) is not None
+
+    @staticmethod
+    def _decode_body(body: bytes, encoding: Optional[str]) -> str:
+        try:
+            return body.decode(encoding or "utf-8", errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
 
     @staticmethod
-    def _flatten_columns(columns) -> List[str]:
+    def _flatten_column_name(parts: tuple) -> str:
+        """合併 MultiIndex 欄名，每個層級只做一次 strip/lower"""
+        kept = []
+        for part in parts:
+            text = str(part).strip()
+            if text and text.lower() != "nan":
+                kept.append(text)
+        return " ".join(kept)
+
+    @classmethod
+    def _flatten_columns(cls, columns) -> List[str]:
         if isinstance(columns, pd.MultiIndex):
-            return [
-                " ".join(str(part).strip() for part in tup if str(part).strip() and str(part).strip().lower() != "nan").strip()
-                for tup in columns
-            ]
+            return list(map(cls._flatten_column_name, columns))
         return [str(col).strip() for col in columns]
 
-    @staticmethod
-    def _extract_product_code(raw_name: str) -> Optional[str]:
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _extract_product_code(cls, raw_name: str) -> Optional[str]:
         text = str(raw_name or "").upper()
         if not text:
             return None
-        if any(keyword in text for keyword in ["DATE", "FEE", "TOTAL"]):
+        if any(keyword in text for keyword in cls._SKIP_KEYWORDS):
             return None
-        match = re.search(r"\b([A-Z]{3,6})\b", text)
+        match = cls._PRODUCT_CODE_RE.search(text)
         if not match:
             return None
         code = match.group(1)
-        if code in {"USD", "AUM", "NAV", "FLOW", "FLOWS"}:
+        if code in cls._SKIP_CODES:
             return None
         return code
 
+    @classmethod
+    def _build_schema_fingerprint(cls, product_codes: List[str], columns: List[str]) -> str:
+        return cls._fingerprint_cached(
+            tuple(sorted({code.upper() for code in product_codes})),
+            tuple(str(col).strip() for col in columns),
+        )
+
     @staticmethod
-    def _build_schema_fingerprint(product_codes: List[str], columns: List[str]) -> str:
+    @lru_cache(maxsize=16)
+    def _fingerprint_cached(products: Tuple[str, ...], columns: Tuple[str, ...]) -> str:
+        """表格結構只在 Farside 改版時變動，相同結構直接命中快取"""
         payload = {
-            "products": sorted({code.upper() for code in product_codes}),
-            "columns": [str(col).strip() for col in columns],
+            "products": list(products),
+            "columns": list(columns),
         }
         canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True)
         return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-    @staticmethod
-    def _extract_last_updated_text(html: str) -> Optional[str]:
+    @classmethod
+    def _extract_last_updated_text(cls, html: str) -> Optional[str]:
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            tokens = [t.strip() for t in soup.stripped_strings if t.strip()]
+            tokens = cls._extract_text_tokens(html)
             for idx, token in enumerate(tokens):
                 if "last updated" not in token.lower():
                     continue
@@ -403,75 +564,106 @@ class FarsideInvestorsETFCollector:
                 return token
 
             raw_text = " ".join(tokens)
-            match = re.search(r"(last\s+updated[^.;]{0,100})", raw_text, flags=re.IGNORECASE)
+            match = cls._LAST_UPDATED_RE.search(raw_text)
             return match.group(1).strip() if match else None
         except Exception:
             return None
 
+    @staticmethod
+    def _extract_text_tokens(html: str) -> List[str]:
+        """以 lxml 取出頁面可見文字；lxml 無法解析時才改用 BeautifulSoup"""
+        try:
+            root = lxml_html.fromstring(html)
+        except Exception:
+            from bs4 import BeautifulSoup
+
+            soup = BeautifulSoup(html, "html.parser")
+            return [t.strip() for t in soup.stripped_strings if t.strip()]
+        etree.strip_elements(root, "script", "style", "template", etree.Comment, with_tail=False)
+        return [t.strip() for t in root.itertext() if t.strip()]
+
+    def _playwright_launch_kwargs(self) -> Dict:
+        launch_kwargs = {
+            "headless": self.playwright_headless,
+            "args": [
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--disable-blink-features=AutomationControlled",
+                "--disable-extensions",
+            ],
+        }
+        if self.playwright_executable and os.path.exists(self.playwright_executable):
+            launch_kwargs["executable_path"] = self.playwright_executable
+        return launch_kwargs
+
     def _fetch_with_playwright(self, url: str, max_retries: int = 2) -> Optional[str]:
-        """主路徑：Playwright 抓取（可啟用 stealth）"""
+        """
+        主路徑：Playwright 抓取（可啟用 stealth）。
+        同一次呼叫內的重試共用同一個 Chromium，只在每次嘗試開新的 context（乾淨 cookies）。
+        """
         if not self.use_playwright or sync_playwright is None:
             return None
 
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(**self._playwright_launch_kwargs())
+                try:
+                    return self._fetch_with_playwright_browser(browser, url, max_retries)
+                finally:
+                    browser.close()
+        except Exception as e:
+            logger.error(f"Playwright fetch failed for {url}: {e}")
+            return None
+
+    def _fetch_with_playwright_browser(self, browser, url: str, max_retries: int) -> Optional[str]:
         for attempt in range(max_retries):
             try:
                 logger.info(f"Fetching {url} (playwright, attempt {attempt + 1}/{max_retries})...")
-                with sync_playwright() as p:
-                    launch_kwargs = {
-                        "headless": self.playwright_headless,
-                        "args": [
-                            "--no-sandbox",
-                            "--disable-dev-shm-usage",
-                            "--disable-blink-features=AutomationControlled",
-                        ],
-                    }
-                    if self.playwright_executable and os.path.exists(self.playwright_executable):
-                        launch_kwargs["executable_path"] = self.playwright_executable
-
-                    browser = p.chromium.launch(**launch_kwargs)
-                    context = browser.new_context()
-                    page = context.new_page()
-
-                    def _route_handler(route):
-                        if route.request.resource_type in self.blocked_resource_types:
-                            return route.abort()
-                        return route.continue_()
-
-                    page.route("**/*", _route_handler)
-                    if self.use_stealth and not self._apply_stealth(page, context):
-                        logger.warning("Stealth is enabled but was not applied")
-
-                    response = page.goto(url, wait_until="domcontentloaded", timeout=45000)
-                    page.wait_for_timeout(3000)
+                context = browser.new_context()
+                page = context.new_page()
+
+                def _route_handler(route):
+                    if route.request.resource_type in self.blocked_resource_types:
+                        return route.abort()
+                    return route.continue_()
+
+                page.route("**/*", _route_handler)
+                if self.use_stealth and not self._apply_stealth(page, context):
+                    logger.warning("Stealth is enabled but was not applied")
+
+                response = page.goto(url, wait_until="domcontentloaded", timeout=45000)
+                # 等到主表列數足夠即返回，取代固定的 sleep；逾時仍沿用目前 HTML
+                try:
+                    page.wait_for_function(
+                        f"document.querySelectorAll('table tr').length > {self.PLAYWRIGHT_MIN_TABLE_ROWS}",
+                        timeout=self.PLAYWRIGHT_TABLE_TIMEOUT_MS,
+                    )
+                except PlaywrightTimeoutError:
+                    logger.warning("Playwright did not find table rows within timeout, continue with current HTML")
+
+                html = page.content()
+                status_code = response.status if response else None
+
+                # 若已經拿到正常頁面，也順手把 cookie/UA 存起來給 curl_cffi reuse
+                if self.hybrid_cookie_enabled and not self._is_challenge_page(html, status_code):
                     try:
-                        page.wait_for_selector("table", timeout=15000)
-                    except PlaywrightTimeoutError:
-                        logger.warning("Playwright did not find table within timeout, continue with current HTML")
-
-                    html = page.content()
-                    status_code = response.status if response else None
-
-                    # 若已經拿到正常頁面，也順手把 cookie/UA 存起來給 curl_cffi reuse
-                    if self.hybrid_cookie_enabled and not self._is_challenge_page(html, status_code):
-                        try:
-                            ua = page.evaluate("navigator.userAgent")
-                        except Exception:
-                            ua = None
-                        cookies_list = context.cookies()
-                        cookies = {c.get("name"): c.get("value") for c in cookies_list if c.get("name") and c.get("value")}
-                        if cookies or ua:
-                            identity = {
-                                "cookies": cookies,
-                                "user_agent": ua,
-                                "source": "playwright",
-                                "captured_at": datetime.now(timezone.utc).isoformat(),
-                            }
-                            self._identity_cache = identity
-                            self._save_identity_cache(identity)
+                        ua = page.evaluate("navigator.userAgent")
+                    except Exception:
+                        ua = None
+                    cookies_list = context.cookies()
+                    cookies = {c.get("name"): c.get("value") for c in cookies_list if c.get("name") and c.get("value")}
+                    if cookies or ua:
+                        identity = {
+                            "cookies": cookies,
+                            "user_agent": ua,
+                            "source": "playwright",
+                            "captured_at": datetime.now(timezone.utc).isoformat(),
+                        }
+                        self._identity_cache = identity
+                        self._save_identity_cache(identity)
 
-                    page.close()
-                    context.close()
-                    browser.close()
+                page.close()
+                context.close()
 
                 if self._is_challenge_page(html, status_code):
                     logger.warning(f"⚠️ Cloudflare challenge detected in Playwright path (status={status_code})")
@@ -480,7 +672,7 @@ class FarsideInvestorsETFCollector:
                         continue
                     return None
 
-                if len(html) < 6000:
+                if len(html) < self.MIN_PAGE_CHARS:
                     logger.warning(f"Playwright content too short ({len(html)} bytes)")
                     if attempt < max_retries - 1:
                         time_module.sleep(2)
@@ -497,22 +689,76 @@ class FarsideInvestorsETFCollector:
                     return None
         return None
 
+    def _identity_request_args(self) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, str]]]:
+        """依目前身份（cookies + UA）組出 curl_cffi 請求的 headers / cookies"""
+        identity = self._get_identity() if self.hybrid_cookie_enabled else None
+        if not identity:
+            return None, None
+        ua = identity.get("user_agent")
+        headers = {"User-Agent": ua} if ua else None
+        return headers, identity.get("cookies") or None
+
+    async def _afetch(self, session: AsyncSession, url: str) -> Optional[str]:
+        """非同步單次抓取（不含 Playwright 身份刷新）；失敗或遇到 challenge 回傳 None"""
+        try:
+            headers, cookies = self._identity_request_args()
+            response = await session.get(url, timeout=30, headers=headers, cookies=cookies)
+            raw = response.content
+        except Exception as e:
+            logger.warning(f"curl_cffi async fetch failed for {url}: {e}")
+            return None
+        # 先以 bytes 檢查 challenge/狀態碼，確定可用才解碼整頁
+        if response.status_code == 403 or self._is_challenge_bytes(raw):
+            logger.warning(f"⚠️ Cloudflare challenge detected in async curl_cffi path (status={response.status_code})")
+            return None
+        if response.status_code >= 400:
+            logger.warning(f"curl_cffi async fetch unusable for {url} (status={response.status_code})")
+            return None
+        html = self._decode_body(raw, response.encoding)
+        if len(html) < self.MIN_PAGE_CHARS:
+            logger.warning(f"curl_cffi async fetch unusable for {url} (status={response.status_code}, {len(html)} bytes)")
+            return None
+        logger.info(f"✅ Successfully fetched with async curl_cffi ({len(html)} bytes)")
+        return html
+
+    async def fetch_all_async(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        以單一 AsyncSession（HTTP/2 多工）同時抓取多個頁面。
+        AsyncSession 綁定 event loop，因此每次呼叫各自建立並關閉。
+        """
+        async with AsyncSession(
+            impersonate=self.curl_impersonate,
+            http_version=CurlHttpVersion.V2TLS,
+            default_headers=True,
+            timeout=30,
+        ) as session:
+            results = list(await asyncio.gather(*(self._afetch(session, url) for url in urls)))
+            if any(results):
+                self._persist_session_cookies(session.cookies)
+            return results
+
+    def fetch_all(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        fetch_all_async 的同步包裝（供排程 / CLI 使用）。
+        有安裝 uvloop 時只在這次執行使用其 event loop，不更動全域 policy。
+        """
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            return runner.run(self.fetch_all_async(urls))
+
     def _fetch_with_curl_cffi(self, url: str, max_retries: int = 3) -> Optional[str]:
         """備援：使用 curl_cffi Session 抓取頁面"""
         for attempt in range(max_retries):
             try:
                 logger.info(f"Fetching {url} (curl_cffi, attempt {attempt + 1}/{max_retries})...")
-                identity = self._get_identity() if self.hybrid_cookie_enabled else None
-                headers = {}
-                cookies = None
-                if identity:
-                    ua = identity.get("user_agent")
-                    if ua:
-                        headers["User-Agent"] = ua
-                    cookies = identity.get("cookies") or None
-
-                response = self.session.get(url, timeout=30, headers=headers or None, cookies=cookies)
-                html = response.text
+                headers, cookies = self._identity_request_args()
+                response = self.session.get(
+                    url, timeout=30, headers=headers, cookies=cookies, stream=True
+                )
+                try:
+                    html = self._read_streamed_html(response)
+                finally:
+                    response.close()
 
                 if self._is_challenge_page(html, response.status_code):
                     logger.warning(f"⚠️ Cloudflare challenge detected in curl_cffi path (status={response.status_code})")
@@ -530,7 +776,7 @@ class FarsideInvestorsETFCollector:
                     return None
 
                 response.raise_for_status()
-                if len(html) < 6000:
+                if len(html) < self.MIN_PAGE_CHARS:
                     logger.warning(f"curl_cffi content too short ({len(html)} bytes)")
                     if attempt < max_retries - 1:
                         time_module.sleep(2)
@@ -538,6 +784,7 @@ class FarsideInvestorsETFCollector:
                     return None
 
                 logger.info(f"✅ Successfully fetched with curl_cffi ({len(html)} bytes)")
+                self._persist_session_cookies(self.session.cookies)
                 return html
             except Exception as e:
                 logger.error(f"curl_cffi fetch failed for {url}: {e}")
@@ -547,6 +794,23 @@ class FarsideInvestorsETFCollector:
                     return None
         return None
 
+    def _read_streamed_html(self, response) -> str:
+        """
+        串流讀取 curl_cffi 回應：頁首一旦判定為 Cloudflare challenge 就中止下載；
+        正常頁面則在讀完後一次性解碼。
+        """
+        if response.status_code == 403:
+            return ""
+        chunks: List[bytes] = []
+        head = b""
+        for chunk in response.iter_content():
+            chunks.append(chunk)
+            if len(head) < self.CHALLENGE_SCAN_CHARS:
+                head = (head + chunk)[:self.CHALLENGE_SCAN_CHARS]
+                if len(head) == self.CHALLENGE_SCAN_CHARS and self._is_challenge_bytes(head):
+                    return head.decode("utf-8", errors="ignore")
+        return self._decode_body(b"".join(chunks), response.encoding)
+
     def _fetch_page_with_retry(self, url: str, max_retries: int = 3) -> Tuple[Optional[str], str]:
         """階梯式抓取策略：Playwright -> curl_cffi（Selenium 已移除）"""
         html = self._fetch_with_playwright(url, max_retries=min(max_retries, 2))
@@ -559,13 +823,40 @@ class FarsideInvestorsETFCollector:
 
         return None, "none"
 
+    def _locate_etf_table_html(self, html: str) -> Optional[str]:
+        """以 lxml XPath 直接定位含 Date 表頭的最大 <table>，只回傳該表的 HTML"""
+        try:
+            root = lxml_html.fromstring(html)
+        except Exception:
+            return None
+        candidates = root.xpath(self._DATE_TABLE_XPATH)
+        if not candidates:
+            return None
+        table = max(candidates, key=lambda t: len(t.xpath(".//tr")))
+        return lxml_html.tostring(table, encoding="unicode")
+
     def _select_etf_table(self, html: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
-        """從 read_html 結果中選出最可能的 ETF 主表"""
+        """
+        選出 ETF 主表：先只解析 XPath 定位到的單一表格；
+        若定位失敗或驗證不過，再退回解析整頁所有表格並評分。
+        """
+        table_html = self._locate_etf_table_html(html)
+        if table_html is not None:
+            try:
+                df, date_col = self._pick_etf_table(pd.read_html(StringIO(table_html), flavor="lxml"))
+            except ValueError:
+                df, date_col = None, None
+            if df is not None:
+                return df, date_col
+
         try:
-            tables = pd.read_html(StringIO(html))
+            tables = pd.read_html(StringIO(html), flavor="lxml")
         except ValueError:
             return None, None
+        return self._pick_etf_table(tables)
 
+    def _pick_etf_table(self, tables: List[pd.DataFrame]) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """依日期可解析數量與欄位數，為候選表格評分"""
         best_df: Optional[pd.DataFrame] = None
         best_date_col: Optional[str] = None
         best_score = -1
@@ -578,8 +869,7 @@ class FarsideInvestorsETFCollector:
             candidate.columns = self._flatten_columns(candidate.columns)
             date_col = next((c for c in candidate.columns if "date" in c.lower()), candidate.columns[0])
 
-            sample = candidate[date_col].head(20).tolist()
-            parsed_count = sum(1 for item in sample if self._parse_date(item) is not None)
+            parsed_count = int(self._parse_date_series(candidate[date_col].head(20)).notna().sum())
             if parsed_count < 2:
                 continue
 
@@ -591,8 +881,8 @@ class FarsideInvestorsETFCollector:
 
         return best_df, best_date_col
 
-    def _parse_etf_table(self, html: str, asset_type: str) -> List[Dict]:
-        """使用 pandas.read_html 解析 ETF 主表"""
+    def _parse_etf_table(self, html: str, asset_type: str, cutoff: Optional[date] = None) -> List[Dict]:
+        """使用 pandas.read_html 解析 ETF 主表；給定 cutoff 時只解析該日（含）之後的列"""
         try:
             df, date_col = self._select_etf_table(html)
             if df is None or date_col is None:
@@ -615,12 +905,12 @@ class FarsideInvestorsETFCollector:
                 self._record_schema_change(asset_type, "missing_product_codes", html, [], url=None)
                 return []
 
+            # _extract_product_code 回傳的代碼已是大寫，下游不必再逐一 .upper()
             product_codes = [code for _, code in product_columns]
             known_codes = self._known_products(asset_type)
-            unknown_codes = [code for code in product_codes if code.upper() not in known_codes]
+            unknown_codes = [code for code in product_codes if code not in known_codes]
             if unknown_codes:
-                self.last_unknown_codes.setdefault(asset_type, set()).update([c.upper() for c in unknown_codes])
-                self._trim_unknown_codes(asset_type)
+                self._remember_unknown_codes(asset_type, unknown_codes)
                 logger.warning(f"Detected unknown ETF product codes ({asset_type}): {sorted(set(unknown_codes))}")
                 self._record_schema_change(asset_type, "unknown_product_codes", html, product_codes, url=None)
 
@@ -628,32 +918,59 @@ class FarsideInvestorsETFCollector:
             schema_fingerprint = self._build_schema_fingerprint(product_codes, columns)
             fetch_method = self.last_fetch_method.get(asset_type, "unknown")
 
-            results = []
-            for _, row in df.iterrows():
-                flow_date = self._parse_date(row.get(date_col))
-                if not flow_date:
-                    continue
-                timestamp = self._market_close_timestamp(flow_date)
+            # 先整欄解析日期並剔除非資料列（Total/Average 等），再解析金額
+            dates = self._parse_date_series(df[date_col])
+            has_date = dates.notna()
+            df = df.loc[has_date]
+            dates = dates.loc[has_date]
+            if cutoff is not None:
+                # 回溯窗外的歷史列在解析金額前就剔除，不做任何逐格工作
+                recent = (dates >= cutoff).astype(bool)
+                df = df.loc[recent]
+                dates = dates.loc[recent]
+
+            flow_df = self._parse_flow_frame(df[[column_name for column_name, _ in product_columns]])
+            flow_df.insert(0, "date", dates)
+            # 寬表轉長表（維持逐列、逐產品的順序），純量欄位以整欄廣播，最後一次轉成 records
+            flows = (
+                flow_df.melt(id_vars="date", var_name="column_name", value_name="net_flow_usd", ignore_index=False)
+                .dropna(subset=["net_flow_usd"])
+                .sort_index(kind="stable")
+            )
+            if flows.empty:
+                return []
 
-                for column_name, code in product_columns:
-                    flow_usd = self._parse_flow_value(row.get(column_name))
-                    if flow_usd is None:
-                        continue
-                    issuer, canonical_code = self._extract_product_info(code, asset_type)
-                    results.append({
-                        'date': flow_date,
-                        'timestamp': timestamp,
-                        'product_code': canonical_code,
-                        'product_name': code,
-                        'issuer': issuer,
-                        'asset_type': asset_type,
-                        'net_flow_usd': flow_usd,
-                        'total_aum_usd': None,
-                        'source_url': self.current_url,
-                        'source_last_updated': last_updated,
-                        'schema_fingerprint': schema_fingerprint,
-                        'fetch_method': fetch_method,
-                    })
+            product_names = dict(product_columns)
+            product_info = {code: self._lookup_product_info(code, asset_type) for code in product_names.values()}
+            timestamps = {flow_date: self._market_close_timestamp(flow_date) for flow_date in dates.unique()}
+
+            names = flows["column_name"].map(product_names)
+            flows = flows.assign(
+                timestamp=pd.Series([timestamps[d] for d in flows["date"]], index=flows.index, dtype=object),
+                product_code=names.map({code: info[1] for code, info in product_info.items()}),
+                product_name=names,
+                issuer=names.map({code: info[0] for code, info in product_info.items()}),
+                asset_type=asset_type,
+                total_aum_usd=None,
+                source_url=self.current_url,
+                source_last_updated=last_updated,
+                schema_fingerprint=schema_fingerprint,
+                fetch_method=fetch_method,
+            )
+            results = flows[[
+                'date',
+                'timestamp',
+                'product_code',
+                'product_name',
+                'issuer',
+                'asset_type',
+                'net_flow_usd',
+                'total_aum_usd',
+                'source_url',
+                'source_last_updated',
+                'schema_fingerprint',
+                'fetch_method',
+            ]].to_dict("records")
 
             return results
         except Exception as e:
@@ -662,11 +979,20 @@ class FarsideInvestorsETFCollector:
             return []
 
     def _extract_product_info(self, product_name: str, asset_type: str) -> tuple:
-        products = self.BTC_PRODUCTS if asset_type == 'BTC' else self.ETH_PRODUCTS
-        for code, (issuer, _) in products.items():
-            if code.upper() in str(product_name).upper():
+        return self._lookup_product_info(str(product_name).upper(), asset_type)
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _lookup_product_info(cls, name: str, asset_type: str) -> tuple:
+        """產品代碼集合封閉且欄名固定，快取命中率接近 100%"""
+        lookup = cls._BTC_UPPER if asset_type == 'BTC' else cls._ETH_UPPER
+        exact = lookup.get(name)
+        if exact is not None:
+            return exact
+        for upper_code, (issuer, code) in lookup.items():
+            if upper_code in name:
                 return issuer, code
-        return 'Unknown', str(product_name).upper()[:10]
+        return 'Unknown', name[:10]
 
     def _parse_flow_value(self, value) -> Optional[float]:
         """統一解析 Farside 金額欄位，輸出 USD"""
@@ -681,7 +1007,12 @@ class FarsideInvestorsETFCollector:
                 return 0.0
             return numeric * 1_000_000
 
-        raw = str(value).strip()
+        return self._parse_flow_text(str(value).strip())
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_flow_text(raw: str) -> Optional[float]:
+        """字串金額解析（'-'、'0.0'、'(5.2)' 等值大量重複，結果可快取）"""
         if not raw or raw.lower() in {'nan', 'none', '-', '—', '–'}:
             return None
 
@@ -732,6 +1063,63 @@ class FarsideInvestorsETFCollector:
         amount = numeric * multiplier
         return -amount if is_negative else amount
 
+    @staticmethod
+    def _parse_flow_series(values: pd.Series) -> pd.Series:
+        """
+        以 pandas 字串運算整欄解析金額（語意與 _parse_flow_value 一致），
+        無法解析的儲存格回傳 NaN。
+        """
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            return values.astype("float64") * 1_000_000
+
+        is_text = values.map(lambda v: isinstance(v, str)).astype(bool)
+        # 非字串儲存格（例如 object 欄位中的數字）沿用數值路徑：一律視為百萬美元
+        numeric_cells = pd.to_numeric(values.where(~is_text), errors="coerce") * 1_000_000
+
+        def _mask(flags: pd.Series) -> pd.Series:
+            return flags.fillna(False).astype(bool)
+
+        raw = values.where(is_text, "").astype(object).str.strip()
+        valid = is_text & ~raw.str.lower().isin(['', 'nan', 'none', '-', '—', '–'])
+
+        paren = _mask(raw.str.startswith("(") & raw.str.endswith(")"))
+        raw = raw.mask(paren, raw.str.slice(1, -1))
+        minus = _mask(raw.str.startswith("-"))
+        raw = raw.mask(minus, raw.str.slice(1))
+        raw = raw.mask(_mask(raw.str.startswith("+")), raw.str.slice(1))
+        is_negative = paren | minus
+
+        lower = raw.str.replace("$", "", regex=False).str.replace(",", "", regex=False).str.strip().str.lower()
+
+        multiplier = pd.Series(1_000_000.0, index=values.index)
+        explicit_unit = pd.Series(False, index=values.index)
+        for suffix, factor in [("billion", 1_000_000_000), ("million", 1_000_000), ("thousand", 1_000)]:
+            hit = _mask(lower.str.contains(suffix, regex=False)) & ~explicit_unit
+            lower = lower.mask(hit, lower.str.replace(suffix, "", regex=False).str.strip())
+            multiplier = multiplier.mask(hit, factor)
+            explicit_unit |= hit
+
+        for suffix, factor in [("b", 1_000_000_000), ("m", 1_000_000), ("k", 1_000)]:
+            hit = _mask(lower.str.endswith(suffix)) & ~explicit_unit
+            lower = lower.mask(hit, lower.str.slice(0, -1).str.strip())
+            multiplier = multiplier.mask(hit, factor)
+            explicit_unit |= hit
+
+        numeric = pd.to_numeric(lower.where(valid), errors="coerce")
+        # 若來源已是絕對美元級（>= 100k）且沒有顯式單位，避免再乘 1e6
+        multiplier = multiplier.mask(~explicit_unit & (numeric.abs() >= 100_000), 1)
+
+        amount = numeric * multiplier
+        amount = amount.mask(is_negative, -amount)
+        return amount.where(is_text, numeric_cells).astype("float64")
+
+    @classmethod
+    def _parse_flow_frame(cls, frame: pd.DataFrame) -> pd.DataFrame:
+        """把整個產品欄區塊攤平成單一 Series，一次向量化解析後再還原形狀"""
+        flat = pd.Series(frame.to_numpy(dtype=object).ravel(), dtype=object)
+        parsed = cls._parse_flow_series(flat).to_numpy().reshape(frame.shape)
+        return pd.DataFrame(parsed, index=frame.index, columns=frame.columns)
+
     def _parse_date(self, date_value) -> Optional[date]:
         if date_value is None:
             return None
@@ -745,69 +1133,140 @@ class FarsideInvestorsETFCollector:
         text = str(date_value).strip()
         if not text:
             return None
+        return self._parse_date_text(text)
+
+    @classmethod
+    @lru_cache(maxsize=2048)
+    def _parse_date_text(cls, text: str) -> Optional[date]:
+        """字串日期解析（同一批表格日期高度重複，結果可快取；每輪收集開始時清空）"""
         text = text.replace(".", "/")
 
-        formats = [
-            '%d %b %Y',
-            '%d %B %Y',
-            '%m/%d/%Y',
-            '%d/%m/%Y',
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-        ]
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(text, fmt).date()
+        # 依原格式優先序：'%d %b %Y' / '%d %B %Y'、'%m/%d/%Y' -> '%d/%m/%Y'、'%Y-%m-%d' / '%Y/%m/%d'
+        match = cls._DATE_RE.match(text)
+        if match:
+            day, month_name, year, first, second, slash_year, iso_year, _, iso_month, iso_day = match.groups()
+            if month_name:
+                candidates = [(int(year), cls._MONTHS.get(month_name.lower()), int(day))]
+            elif first:
+                candidates = [
+                    (int(slash_year), int(first), int(second)),
+                    (int(slash_year), int(second), int(first)),
+                ]
+            else:
+                candidates = [(int(iso_year), int(iso_month), int(iso_day))]
+            for year_value, month_value, day_value in candidates:
+                if not month_value:
+                    continue
+                try:
+                    dt = date(year_value, month_value, day_value)
+                except ValueError:
+                    continue
                 if dt.year == 1900:
                     dt = dt.replace(year=datetime.now().year)
                 return dt
-            except ValueError:
-                continue
 
+        # 不含任何數字的儲存格（Total/Average/Maximum 等摘要列）不可能是日期，免走 dateutil
+        if not cls._HAS_DIGIT_RE.search(text):
+            return None
         fallback = pd.to_datetime(text, errors='coerce')
         if pd.isna(fallback):
             return None
         return fallback.to_pydatetime().date()
 
+    def _parse_date_series(self, values: pd.Series) -> pd.Series:
+        """
+        整欄解析日期：先以 PRIMARY_DATE_FORMAT 向量化解析，
+        未命中的儲存格再逐格交給 _parse_date，結果與逐格解析一致。
+        """
+        is_text = values.map(lambda v: isinstance(v, str)).astype(bool)
+        text = values.where(is_text, "").astype(object).str.strip()
+        # cache=True：相同日期字串只解析一次
+        parsed = pd.to_datetime(
+            text.where(is_text), format=self.PRIMARY_DATE_FORMAT, errors="coerce", cache=True
+        )
+        dates = parsed.dt.date.astype(object).where(parsed.notna(), None)
+        missing = parsed.isna() & values.notna()
+        if missing.any():
+            dates.loc[missing] = [self._parse_date(raw) for raw in values.loc[missing]]
+        return dates
+
     def run_collection(self, db_loader, days: int = 7) -> int:
         logger.info(f"=== ETF Collection Start === (lookback_days={days})")
-        self.last_unknown_codes = {}
+        # 限制解析快取的生命週期（也讓 1900 年補正隨當年年份更新）
+        self._parse_date_text.cache_clear()
+        self._parse_flow_text.cache_clear()
+        self.last_unknown_codes = defaultdict(OrderedDict)
         self.last_fetch_method = {}
 
+        targets = [(self.BASE_URL_BTC, 'BTC'), (self.BASE_URL_ETH, 'ETH')]
+        prefetched: Dict[str, str] = {}
+        if not self.use_playwright or (self.hybrid_cookie_enabled and self._get_identity()):
+            # 純 curl_cffi 模式，或 Hybrid 模式已有可重用身份：先以 AsyncSession（HTTP/2 多工）
+            # 同時抓取所有頁面，未成功者再走 Playwright -> curl_cffi 的同步重試流程
+            for (url, asset), html in zip(targets, self.fetch_all([url for url, _ in targets])):
+                if html:
+                    prefetched[asset] = html
+
+        fetched: Dict[str, Tuple[Optional[str], str]] = {
+            asset: (html, "curl_cffi") for asset, html in prefetched.items()
+        }
+        pending = [(url, asset) for url, asset in targets if asset not in fetched]
+        if pending:
+            # 抓取以網路等待為主，BTC/ETH 並行；解析仍在呼叫端執行緒依序進行
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(pending))) as executor:
+                futures = {executor.submit(self._fetch_page_with_retry, url): asset for url, asset in pending}
+                for future in as_completed(futures):
+                    fetched[futures[future]] = future.result()
+
+        cutoff = datetime.now(self.market_tz).date() - timedelta(days=days)
         results = []
         source_stats = {}
-        for url, asset in [(self.BASE_URL_BTC, 'BTC'), (self.BASE_URL_ETH, 'ETH')]:
+        for url, asset in targets:
             self.current_url = url
-            html, method = self._fetch_page_with_retry(url)
+            html, method = fetched[asset]
             self.last_fetch_method[asset] = method
             source_stats[asset] = method
             if html:
-                parsed = self._parse_etf_table(html, asset)
+                parsed = self._parse_etf_table(html, asset, cutoff=cutoff)
                 logger.info(f"Parsed {len(parsed)} ETF rows for {asset} (method={method})")
                 results.extend(parsed)
             else:
                 logger.warning(f"No HTML retrieved for {asset} (method={method})")
 
+        # 本輪排入的快照在回傳前寫完，不留到下一輪或物件回收
+        self._flush_snapshots()
+
         if not results:
             logger.warning("No ETF data retrieved from Farside")
             return 0
 
-        cutoff = datetime.now(self.market_tz).date() - timedelta(days=days)
-        filtered = [r for r in results if r['date'] >= cutoff]
-        inserted = db_loader.insert_etf_flows_batch(filtered)
+        inserted = db_loader.insert_etf_flows_batch(results)
 
         logger.info(
             "=== ETF Collection Done === "
             f"inserted={inserted}, total_parsed={len(results)}, "
-            f"filtered={len(filtered)}, source_stats={source_stats}"
+            f"cutoff={cutoff.isoformat()}, source_stats={source_stats}"
         )
         return inserted
 
     def get_last_unknown_codes(self) -> Dict[str, List[str]]:
         """返回最近一次收集偵測到的未知產品代碼"""
-        return {k: sorted(list(v)) for k, v in self.last_unknown_codes.items()}
+        return {k: sorted(v) for k, v in self.last_unknown_codes.items()}
+
+    def _flush_snapshots(self) -> None:
+        """等待已排入的快照寫檔完成"""
+        pending, self._snapshot_futures = self._snapshot_futures, []
+        wait(pending)
+
+    def close(self):
+        """寫完排入的快照並關閉連線"""
+        self._snapshot_executor.shutdown(wait=True)
+        self.session.close()
 
     def __del__(self):
         """確保釋放資源"""
+        # __del__ 可能在快照 worker 執行緒上觸發，等待自己會拋 RuntimeError，故不等待
+        if hasattr(self, '_snapshot_executor'):
+            self._snapshot_executor.shutdown(wait=False)
         if hasattr(self, 'session'):
             self.session.close()
@@ -1,9 +1,12 @@
 import requests
-from typing import Optional, Dict
-from datetime import datetime
+from typing import Optional, Dict, Tuple
+from datetime import datetime, timezone
 import os
+import time
 from loguru import logger
 
+from connectors._http import get_session, loads_json
+
 class FearGreedIndexCollector:
     """
     Fear & Greed Index 抓取器
@@ -21,7 +24,11 @@ class FearGreedIndexCollector:
 
     def __init__(self):
         """初始化收集器（無需 API Key）"""
-        pass
+        # 共用連線池（含重試策略）：排程重複呼叫時不必每次重新 TCP + TLS 握手
+        self.session = get_session()
+        self.headers = {'Accept': 'application/json'}
+        # 最新值快取：(monotonic 到期時間, 結果)；到期時間取自 API 回傳的 time_until_update
+        self._latest_cache: Optional[Tuple[float, Dict]] = None
 
     def _classify_value(self, value: int) -> str:
         """將數值轉換為分類標籤"""
@@ -42,21 +49,27 @@ class FearGreedIndexCollector:
         
         Returns:
             {
-                'timestamp': datetime object,
+                'timestamp': datetime object (UTC, tz-aware),
                 'value': int (0-100),
                 'classification': str
             }
         """
+        cached = self._latest_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            logger.info("Fear & Greed Index not yet updated upstream, reuse cached value")
+            return cached[1]
+
         try:
             logger.info("Fetching latest Fear & Greed Index from Alternative.me...")
-            response = requests.get(
+            response = self.session.get(
                 self.BASE_URL,
                 params={"limit": 1, "format": "json"},
+                headers=self.headers,
                 timeout=10
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = loads_json(response.content)
             
             if not data.get('data'):
                 logger.warning("No data returned from Fear & Greed API")
@@ -64,13 +77,17 @@ class FearGreedIndexCollector:
             
             latest = data['data'][0]
             value = int(latest['value'])
-            timestamp = datetime.fromtimestamp(int(latest['timestamp']))
+            timestamp = datetime.fromtimestamp(int(latest['timestamp']), tz=timezone.utc)
             
             result = {
                 'timestamp': timestamp,
                 'value': value,
                 'classification': self._classify_value(value)
             }
+            # 指數每日更新一次，排程每 6 小時呼叫：下次更新前直接重用，不必再打 API
+            time_until_update = int(latest.get('time_until_update') or 0)
+            if time_until_update > 0:
+                self._latest_cache = (time.monotonic() + time_until_update, result)
             
             logger.info(
                 f"Fear & Greed Index: {result['value']} ({result['classification']}) "
@@ -97,14 +114,15 @@ class FearGreedIndexCollector:
         """
         try:
             logger.info(f"Fetching {days} days of Fear & Greed Index history...")
-            response = requests.get(
+            response = self.session.get(
                 self.BASE_URL,
                 params={"limit": days, "format": "json"},
+                headers=self.headers,
                 timeout=15
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = loads_json(response.content)
             
             if not data.get('data'):
                 logger.warning("No historical data returned")
@@ -113,7 +131,7 @@ class FearGreedIndexCollector:
             results = []
             for item in data['data']:
                 value = int(item['value'])
-                timestamp = datetime.fromtimestamp(int(item['timestamp']))
+                timestamp = datetime.fromtimestamp(int(item['timestamp']), tz=timezone.utc)
                 
                 results.append({
                     'timestamp': timestamp,
@@ -5,11 +5,14 @@ Funding Rate 收集器
 優化記憶體：使用 ExchangePool 共享 CCXT 實例
 """
 import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime, timezone
 from loguru import logger
 
 from utils.symbol_utils import to_ccxt_format, normalize_symbol
+from utils.time_utils import ms_to_datetime
+from utils.rate_limiter import RateLimiter
 from connectors.exchange_pool import ExchangePool
 
 
@@ -22,6 +25,9 @@ class FundingRateCollector:
     - 避免每個 Collector 重複建立實例
     - 預期減少 60-80 MB 記憶體使用
     """
+
+    # 逐一抓取備援路徑的最大並行數
+    MAX_FETCH_WORKERS = 8
     
     def __init__(self, exchange_name: str, api_key: str = None, api_secret: str = None):
         """
@@ -82,10 +88,7 @@ class FundingRateCollector:
             # 處理下一次結算時間
             next_funding_time_ms = info.get('nextFundingTime')
             if next_funding_time_ms:
-                result['next_funding_time'] = datetime.fromtimestamp(
-                    int(next_funding_time_ms) / 1000,
-                    tz=timezone.utc
-                )
+                result['next_funding_time'] = ms_to_datetime(int(next_funding_time_ms))
             
             # Bybit 預設通常是 8 小時，但我們可以從 API 獲取更準確的資訊（如果有的話）
             # 這裡計算每日費率：Bybit V5 預設 interval 可以在某些 endpoint 查到，
@@ -113,7 +116,7 @@ class FundingRateCollector:
             tickers = self.exchange.fetch_tickers(params={'category': 'linear'})
             
             results = []
-            normalized_targets = [normalize_symbol(s) for s in symbols]
+            normalized_targets = frozenset(normalize_symbol(s) for s in symbols)
             
             for symbol_key, ticker in tickers.items():
                 norm_symbol = normalize_symbol(symbol_key)
@@ -138,7 +141,7 @@ class FundingRateCollector:
                     
                     next_time = info.get('nextFundingTime')
                     if next_time:
-                        res['next_funding_time'] = datetime.fromtimestamp(int(next_time)/1000, tz=timezone.utc)
+                        res['next_funding_time'] = ms_to_datetime(int(next_time))
                     
                     results.append(res)
             
@@ -174,9 +177,10 @@ class FundingRateCollector:
             
             # 解析結果
             results = []
+            norm_symbol = normalize_symbol(symbol)
             for record in history:
                 item = {
-                    'symbol': normalize_symbol(symbol),
+                    'symbol': norm_symbol,
                     'funding_rate': record.get('fundingRate'),
                     'funding_time': None,
                     'mark_price': record.get('markPrice'),
@@ -185,10 +189,7 @@ class FundingRateCollector:
                 
                 # 處理時間戳
                 if record.get('timestamp'):
-                    item['funding_time'] = datetime.fromtimestamp(
-                        record['timestamp'] / 1000,
-                        tz=timezone.utc
-                    )
+                    item['funding_time'] = ms_to_datetime(record['timestamp'])
                 
                 # 計算每日資金費率 (這部分可再優化，目前維持固定 x3)
                 if item['funding_rate'] is not None:
@@ -203,15 +204,28 @@ class FundingRateCollector:
             raise
 
     def _fetch_funding_rates_sequential(self, symbols: List[str]) -> List[Dict]:
-        """原有的循環抓取邏輯作為備援"""
-        results = []
-        for symbol in symbols:
+        """
+        逐一交易對抓取的備援路徑：各 symbol 彼此獨立，以執行緒並行送出，
+        併發數受交易所 rateLimit 換算的每秒請求數限制；結果維持輸入順序。
+        """
+        if not symbols:
+            return []
+
+        # 各執行緒送出前先取得時段，相鄰請求仍間隔 rateLimit 毫秒
+        limiter = RateLimiter.for_exchange(self.exchange)
+
+        def _fetch(symbol: str) -> Optional[Dict]:
+            limiter.acquire()
             try:
-                data = self.fetch_funding_rate(symbol)
-                if data: results.append(data)
-            except: continue
-        return results
-    
+                return self.fetch_funding_rate(symbol)
+            except Exception:
+                # fetch_funding_rate 已記錄錯誤，單一 symbol 失敗不影響其他
+                return None
+
+        max_workers = RateLimiter.max_workers(self.exchange, len(symbols), self.MAX_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [data for data in executor.map(_fetch, symbols) if data]
+
     def get_available_symbols(self) -> List[str]:
         """
         取得交易所支援的永續合約交易對
@@ -220,17 +234,10 @@ class FundingRateCollector:
             List of available perpetual symbols
         """
         try:
-            # 載入市場資訊
-            self.exchange.load_markets()
-            
-            # 篩選永續合約
-            perpetual_symbols = []
-            for symbol, market in self.exchange.markets.items():
-                # 檢查是否為永續合約
-                if market.get('type') == 'swap' or market.get('linear') or market.get('inverse'):
-                    # 只選擇 USDT 結算的合約
-                    if market.get('quote') == 'USDT':
-                        perpetual_symbols.append(normalize_symbol(symbol))
+            # 篩選結果由 ExchangePool 快取，各 collector 共用
+            perpetual_symbols = ExchangePool().get_usdt_perpetuals(
+                self.exchange_name, market_type=self.market_type
+            )
             
             logger.info(
                 f"Found {len(perpetual_symbols)} USDT perpetual symbols on {self.exchange_name}"
@@ -4,19 +4,38 @@ Liquidation Collector
 """
 import os
 import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional
 from loguru import logger
 
+from connectors._http import loads_json
 from connectors.exchange_pool import ExchangePool
 from loaders.db_loader import DatabaseLoader
 from utils.symbol_utils import normalize_symbol
 
 class LiquidationCollector:
+    MAX_FETCH_WORKERS = 8
+    BYBIT_DOMAINS = ("https://api.bybit.com", "https://api.bytick.com")
+    # 主網域多久沒回應就對備援網域發出 hedged request（秒）
+    HEDGE_DELAY_SECONDS = 2.0
+
     def __init__(self):
         self.pool = ExchangePool()
         self.loader = DatabaseLoader()
         self.session = requests.Session()
-        
+        # 跨 symbol 重用 keep-alive 連線；重試次數保守，失敗時還有備援網域可切換
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
         # 偵測代理設定
         proxy = os.getenv('HTTP_PROXY') or os.getenv('http_proxy')
         if proxy:
@@ -31,52 +50,87 @@ class LiquidationCollector:
             return symbol.replace('/', '')
         return symbol
 
+    def _request_bybit_liquidations(self, url_base: str, target_symbol: str, norm_symbol: str) -> Optional[List[Dict]]:
+        """向單一網域請求並解析爆倉列表；失敗（含非 200 / retCode 非 0 / 資料格式錯誤）回傳 None"""
+        url = f"{url_base}/v5/market/liquidation"
+        params = {'category': 'linear', 'symbol': target_symbol, 'limit': 100}
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            if response.status_code == 200:
+                data = loads_json(response.content)
+                if data.get('retCode') == 0 and 'result' in data and 'list' in data['result']:
+                    return self._parse_bybit_liquidations(data['result']['list'], norm_symbol)
+        except Exception as e:
+            logger.debug(f"[Bybit] Domain {url_base} failed: {e}")
+        return None
+
     def collect_bybit(self, symbol: str) -> List[Dict]:
         """
         Bybit V5 Liquidations
         REST 端點在某些地區不穩定，建議未來遷移至 WebSocket
+
+        主網域超過 HEDGE_DELAY_SECONDS 未回應（或已失敗）時，同時向備援網域發出請求，
+        取先成功者，避免慢而未斷的主網域拖滿整個 timeout。
         """
         target_symbol = self._get_ccxt_symbol('bybit', symbol)
-        domains = ["https://api.bybit.com", "https://api.bytick.com"]
-        
-        for url_base in domains:
-            url = f"{url_base}/v5/market/liquidation"
-            params = {'category': 'linear', 'symbol': target_symbol, 'limit': 100}
-            try:
-                response = self.session.get(url, params=params, timeout=self.timeout)
-                if response.status_code == 200:
-                    data = response.json()
-                    liquidations = []
-                    if data.get('retCode') == 0 and 'result' in data and 'list' in data['result']:
-                        for item in data['result']['list']:
-                            side = 'short' if item['side'] == 'Buy' else 'long'
-                            qty = float(item['size'])
-                            price = float(item['price'])
-                            liquidations.append({
-                                'time': int(item['time']),
-                                'exchange': 'bybit',
-                                'symbol': normalize_symbol(symbol),
-                                'side': side,
-                                'price': price,
-                                'quantity': qty,
-                                'value_usd': price * qty
-                            })
+        norm_symbol = normalize_symbol(symbol)
+        backups = list(self.BYBIT_DOMAINS[1:])
+
+        executor = ThreadPoolExecutor(max_workers=len(self.BYBIT_DOMAINS))
+        try:
+            pending = {executor.submit(
+                self._request_bybit_liquidations, self.BYBIT_DOMAINS[0], target_symbol, norm_symbol
+            )}
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=self.HEDGE_DELAY_SECONDS if backups else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    liquidations = future.result()
+                    if liquidations is not None:
                         return liquidations
-            except Exception as e:
-                logger.debug(f"[Bybit] Domain {url_base} failed: {e}")
-                continue
+                # 逾時未回應，或已回應但全部失敗：啟動下一個備援網域
+                if backups and (not done or not pending):
+                    pending.add(executor.submit(
+                        self._request_bybit_liquidations, backups.pop(0), target_symbol, norm_symbol
+                    ))
+        finally:
+            # 不等待落後的請求；其結果直接丟棄
+            executor.shutdown(wait=False, cancel_futures=True)
         return []
 
+    @staticmethod
+    def _parse_bybit_liquidations(items: List[Dict], norm_symbol: str) -> List[Dict]:
+        liquidations = []
+        for item in items:
+            side = 'short' if item['side'] == 'Buy' else 'long'
+            qty = float(item['size'])
+            price = float(item['price'])
+            liquidations.append({
+                'time': int(item['time']),
+                'exchange': 'bybit',
+                'symbol': norm_symbol,
+                'side': side,
+                'price': price,
+                'quantity': qty,
+                'value_usd': price * qty
+            })
+        return liquidations
+
     def run_collection(self, symbols: List[str] = ['BTC/USDT', 'ETH/USDT']):
         """
         執行收集任務
         """
         logger.info("Starting Liquidation Collection (Bybit only)...")
         all_data = []
-        
-        for symbol in symbols:
-            # Bybit
-            bybit_data = self.collect_bybit(symbol)
+
+        # 各 symbol 互不相依，並行抓取；map 保持輸入順序
+        with ThreadPoolExecutor(max_workers=max(1, min(len(symbols), self.MAX_FETCH_WORKERS))) as executor:
+            results = list(executor.map(self.collect_bybit, symbols))
+
+        for symbol, bybit_data in zip(symbols, results):
             if bybit_data:
                 logger.info(f"Collected {len(bybit_data)} liquidations from Bybit for {symbol}")
                 all_data.extend(bybit_data)
@@ -4,12 +4,14 @@ Open Interest (未平倉量) 收集器
 
 優化記憶體：使用 ExchangePool 共享 CCXT 實例
 """
-import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime, timezone
 from loguru import logger
 
 from utils.symbol_utils import to_ccxt_format, normalize_symbol
+from utils.time_utils import ms_to_datetime
+from utils.rate_limiter import RateLimiter
 from connectors.exchange_pool import ExchangePool
 
 
@@ -22,6 +24,9 @@ class OpenInterestCollector:
     - 避免每個 Collector 重複建立實例
     - 預期減少 60-80 MB 記憶體使用
     """
+
+    # 批次抓取的最大並行數
+    MAX_FETCH_WORKERS = 8
     
     def __init__(self, exchange_name: str, api_key: str = None, api_secret: str = None):
         """
@@ -55,12 +60,13 @@ class OpenInterestCollector:
             f"(using shared CCXT instance)"
         )
     
-    def fetch_open_interest(self, symbol: str) -> Optional[Dict]:
+    def fetch_open_interest(self, symbol: str, price_hint: Optional[float] = None) -> Optional[Dict]:
         """
         抓取當前未平倉量
         
         Args:
             symbol: 交易對符號 (原生格式: BTCUSDT 或 CCXT格式: BTC/USDT)
+            price_hint: 已知的最新價（批次預先取得），提供時不再逐一呼叫 fetch_ticker
             
         Returns:
             {
@@ -92,31 +98,27 @@ class OpenInterestCollector:
             
             # 處理時間戳
             if oi_data.get('timestamp'):
-                result['timestamp'] = datetime.fromtimestamp(
-                    oi_data['timestamp'] / 1000,
-                    tz=timezone.utc
-                )
+                result['timestamp'] = ms_to_datetime(oi_data['timestamp'])
             else:
                 result['timestamp'] = datetime.now(tz=timezone.utc)
             
-            # 如果缺少 USD 價值或價格，嘗試從 ticker 獲取價格並計算
-            if result['open_interest'] and (not result['open_interest_usd'] or not result['price']):
-                try:
-                    ticker = self.exchange.fetch_ticker(ccxt_symbol)
-                    current_price = ticker.get('last')
+            # 只有缺少 USD 價值時才需要最新價（批次時由 price_hint 提供，否則查 ticker）
+            if result['open_interest'] and not result['open_interest_usd']:
+                current_price = price_hint
+                if not current_price:
+                    try:
+                        ticker = self.exchange.fetch_ticker(ccxt_symbol)
+                        current_price = ticker.get('last')
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch ticker for {symbol} to calculate OI USD: {e}")
                     
-                    if current_price:
-                        if not result['price']:
-                            result['price'] = current_price
-                        
-                        if not result['open_interest_usd']:
-                            result['open_interest_usd'] = result['open_interest'] * current_price
-                            logger.debug(f"Calculated OI USD for {symbol}: {result['open_interest_usd']} (Price: {current_price})")
-                except Exception as e:
-                    logger.warning(f"Failed to fetch ticker for {symbol} to calculate OI USD: {e}")
+                if current_price:
+                    result['price'] = current_price
+                    result['open_interest_usd'] = result['open_interest'] * current_price
+                    logger.debug(f"Calculated OI USD for {symbol}: {result['open_interest_usd']} (Price: {current_price})")
 
             # 如果有價格資訊，使用它
-            # 否則從 openInterestValue / openInterestAmount 計算
+            # 否則從 openInterestValue / openInterestAmount 計算（不需額外請求）
             if oi_data.get('price'):
                 result['price'] = oi_data['price']
             elif result['open_interest'] and result['open_interest_usd'] and not result['price']:
@@ -174,31 +176,10 @@ class OpenInterestCollector:
                 limit=limit
             )
             
-            # 解析結果
-            results = []
-            for record in history:
-                item = {
-                    'symbol': normalize_symbol(symbol),
-                    'open_interest': record.get('openInterestAmount'),
-                    'open_interest_usd': record.get('openInterestValue'),
-                    'timestamp': None,
-                    'price': None,
-                }
-                
-                # 處理時間戳
-                if record.get('timestamp'):
-                    item['timestamp'] = datetime.fromtimestamp(
-                        record['timestamp'] / 1000,
-                        tz=timezone.utc
-                    )
-                
-                # 計算價格
-                if record.get('price'):
-                    item['price'] = record['price']
-                elif item['open_interest'] and item['open_interest_usd']:
-                    item['price'] = item['open_interest_usd'] / item['open_interest']
-                
-                results.append(item)
+            # 解析結果（symbol 每次呼叫只正規化一次）
+            norm_symbol = normalize_symbol(symbol)
+            parse = self._parse_history_record
+            results = [parse(record, norm_symbol) for record in history]
             
             logger.info(
                 f"Fetched {len(results)} historical open interest records for {symbol}"
@@ -210,6 +191,26 @@ class OpenInterestCollector:
             logger.error(f"Failed to fetch open interest history for {symbol}: {e}")
             raise
     
+    @staticmethod
+    def _parse_history_record(record: Dict, norm_symbol: str) -> Dict:
+        """解析單筆歷史未平倉量紀錄（不發出任何請求）"""
+        open_interest = record.get('openInterestAmount')
+        open_interest_usd = record.get('openInterestValue')
+        timestamp = record.get('timestamp')
+
+        # 計算價格
+        price = record.get('price') or None
+        if not price and open_interest and open_interest_usd:
+            price = open_interest_usd / open_interest
+
+        return {
+            'symbol': norm_symbol,
+            'open_interest': open_interest,
+            'open_interest_usd': open_interest_usd,
+            'timestamp': ms_to_datetime(timestamp) if timestamp else None,
+            'price': price,
+        }
+    
     def fetch_open_interest_batch(self, symbols: List[str]) -> List[Dict]:
         """
         批次抓取多個交易對的未平倉量
@@ -221,20 +222,50 @@ class OpenInterestCollector:
             List of open interest records
         """
         results = []
-        for symbol in symbols:
-            try:
-                oi_data = self.fetch_open_interest(symbol)
-                if oi_data:
-                    results.append(oi_data)
-            except Exception as e:
-                logger.error(f"Failed to fetch open interest for {symbol}: {e}")
-                continue
+        if symbols:
+            # 一次 fetch_tickers 取得全部價格，省去每個 symbol 各一次 fetch_ticker
+            price_hints = self._fetch_last_prices(symbols)
+            # 並行執行緒共用限速器，送出間隔仍遵守 exchange.rateLimit
+            limiter = RateLimiter.for_exchange(self.exchange)
+
+            def _fetch(symbol: str) -> Optional[Dict]:
+                limiter.acquire()
+                try:
+                    return self.fetch_open_interest(symbol, price_hint=price_hints.get(symbol))
+                except Exception:
+                    # fetch_open_interest 已記錄錯誤，單一 symbol 失敗不影響其他
+                    return None
+
+            # 各 symbol 彼此獨立，以執行緒並行送出；map 維持輸入順序
+            max_workers = RateLimiter.max_workers(self.exchange, len(symbols), self.MAX_FETCH_WORKERS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = [data for data in executor.map(_fetch, symbols) if data]
         
         logger.info(
             f"Batch fetched {len(results)}/{len(symbols)} open interest from {self.exchange_name}"
         )
         return results
     
+    def _fetch_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        以單一 fetch_tickers 請求取得各 symbol 最新價
+
+        Returns:
+            {輸入 symbol: last price}；不支援或失敗時回傳空 dict（退回逐一 fetch_ticker）
+        """
+        if not self.exchange.has.get('fetchTickers'):
+            return {}
+        try:
+            ccxt_symbols = {s: to_ccxt_format(s, market_type=self.market_type) for s in symbols}
+            tickers = self.exchange.fetch_tickers(list(ccxt_symbols.values()))
+        except Exception as e:
+            logger.warning(f"Failed to prefetch tickers for open interest batch: {e}")
+            return {}
+        return {
+            symbol: (tickers.get(ccxt_symbol) or {}).get('last')
+            for symbol, ccxt_symbol in ccxt_symbols.items()
+        }
+    
     def calculate_oi_change(
         self,
         current_oi: float,
@@ -269,17 +300,10 @@ class OpenInterestCollector:
             List of available perpetual symbols
         """
         try:
-            # 載入市場資訊
-            self.exchange.load_markets()
-            
-            # 篩選永續合約
-            perpetual_symbols = []
-            for symbol, market in self.exchange.markets.items():
-                # 檢查是否為永續合約
-                if market.get('type') == 'swap' or market.get('linear') or market.get('inverse'):
-                    # 只選擇 USDT 結算的合約
-                    if market.get('quote') == 'USDT':
-                        perpetual_symbols.append(normalize_symbol(symbol))
+            # 篩選結果由 ExchangePool 快取，各 collector 共用
+            perpetual_symbols = ExchangePool().get_usdt_perpetuals(
+                self.exchange_name, market_type=self.market_type
+            )
             
             logger.info(
                 f"Found {len(perpetual_symbols)} USDT perpetual symbols on {self.exchange_name}"
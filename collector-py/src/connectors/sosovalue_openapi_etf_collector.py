@@ -99,7 +99,8 @@ class SoSoValueOpenAPIETFFlowsCollector:
     @staticmethod
     def _parse_date(d: str) -> Optional[date]:
         try:
-            return datetime.strptime(str(d), "%Y-%m-%d").date()
+            # API 日期為 ISO 8601（YYYY-MM-DD）；fromisoformat 免去 strptime 的格式解析
+            return date.fromisoformat(str(d))
         except Exception:
             return None
 
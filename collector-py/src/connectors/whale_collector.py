@@ -2,17 +2,20 @@
 Whale Collector (On-chain Data)
 監控區塊鏈大額異動。首波支援 BTC (via mempool.space)。
 """
-import requests
 from datetime import datetime, timezone
 from loguru import logger
 from typing import List, Dict, Optional
 
+from connectors._http import get_session
+
 class WhaleCollector:
     def __init__(self):
         # mempool.space 是開源且不需要 API Key 的優質數據源
         self.btc_api_url = "https://mempool.space/api"
         # 巨鯨定義門檻：50 BTC (約 $2M-$4M USD)
         self.whale_threshold_btc = 50.0
+        # 同一 host 連續三次請求，共用連線池避免每次重新握手
+        self.session = get_session()
 
     def fetch_recent_btc_whales(self) -> List[Dict]:
         """
@@ -20,17 +23,17 @@ class WhaleCollector:
         """
         try:
             # 1. 獲取最新區塊高度
-            height_res = requests.get(f"{self.btc_api_url}/blocks/tip/height", timeout=10)
+            height_res = self.session.get(f"{self.btc_api_url}/blocks/tip/height", timeout=10)
             height_res.raise_for_status()
             tip_height = int(height_res.text)
 
             # 2. 獲取最新區塊中的交易
             # 這裡我們取最近的區塊 hash
-            hash_res = requests.get(f"{self.btc_api_url}/block-height/{tip_height}", timeout=10)
+            hash_res = self.session.get(f"{self.btc_api_url}/block-height/{tip_height}", timeout=10)
             block_hash = hash_res.text
 
             # 3. 獲取區塊內的交易 (分頁抓取前幾頁通常就夠了)
-            tx_res = requests.get(f"{self.btc_api_url}/block/{block_hash}/txs", timeout=15)
+            tx_res = self.session.get(f"{self.btc_api_url}/block/{block_hash}/txs", timeout=15)
             txs = tx_res.json()
 
             whale_txs = []
@@ -5,7 +5,7 @@
 """
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 from typing import List, Dict, Optional
 from datetime import datetime, timezone, date, time
 try:
@@ -17,6 +17,7 @@ from loguru import logger
 
 from config import settings
 from utils.symbol_utils import parse_symbol, normalize_symbol
+from utils.time_utils import ms_to_datetime
 
 
 class DatabaseLoader:
@@ -195,7 +196,7 @@ class DatabaseLoader:
         rows = []
         for candle in ohlcv_data:
             ts_ms, o, h, l, c, v = candle[:6]
-            time_val = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+            time_val = ms_to_datetime(ts_ms)
             rows.append((market_id, time_val, timeframe, o, h, l, c, v))
 
         with self.get_connection() as conn:
@@ -404,16 +405,23 @@ class DatabaseLoader:
 
     def insert_fear_greed_index(self, data: Dict) -> int:
         """插入 Fear & Greed Index (global_indicators)"""
+        return self.insert_fear_greed_index_batch([data])
+
+    def insert_fear_greed_index_batch(self, data_list: List[Dict]) -> int:
+        """批次插入 Fear & Greed Index（歷史回補一次送出，避免逐筆 round-trip）"""
+        if not data_list: return 0
         self.ensure_connection()
+        # 同一批次內重複 time 會讓 ON CONFLICT DO UPDATE 報錯，以最後一筆為準
+        rows = list({d['timestamp']: (d['timestamp'], d['value'], d['classification']) for d in data_list}.values())
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
+                execute_values(cur, """
                     INSERT INTO global_indicators (time, category, name, value, classification)
-                    VALUES (%s, 'sentiment', 'fear_greed', %s, %s)
+                    VALUES %s
                     ON CONFLICT (time, category, name) DO UPDATE SET value = EXCLUDED.value, classification = EXCLUDED.classification
-                """, (data['timestamp'], data['value'], data['classification']))
+                """, rows, template="(%s, 'sentiment', 'fear_greed', %s, %s)", page_size=1000)
                 conn.commit()
-        return 1
+        return len(rows)
 
     def insert_etf_flows_batch(self, etf_flows_data: List[Dict]) -> int:
         """批次插入 ETF 流向 (global_indicators)"""
@@ -491,11 +499,12 @@ class DatabaseLoader:
 
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                execute_batch(cur, """
+                # 多列 VALUES 單一語句送出（DO NOTHING 容許同批重複鍵）
+                execute_values(cur, """
                     INSERT INTO liquidations (time, exchange, symbol, side, price, quantity, value_usd)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    VALUES %s
                     ON CONFLICT (time, exchange, symbol, side, price) DO NOTHING
-                """, rows)
+                """, rows, page_size=1024)
                 conn.commit()
         return len(rows)
 
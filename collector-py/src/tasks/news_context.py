@@ -7,9 +7,11 @@ Why:
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+import re
 from typing import Any
 from urllib.parse import quote_plus
 import xml.etree.ElementTree as ET
@@ -37,8 +39,23 @@ NEGATIVE_KEYWORDS = {
 URGENT_KEYWORDS = {"breaking", "urgent", "emergency", "sec", "fed", "fomc", "cpi", "nfp"}
 
 
-def _score_sentiment(title: str) -> float:
-    text = title.lower()
+def _keyword_re(keywords) -> re.Pattern[str]:
+    """多個子字串關鍵字合併成單一 regex，一次掃描取代逐一 `k in text`（輸入需已轉小寫）"""
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords)))
+
+
+_URGENT_RE = _keyword_re(URGENT_KEYWORDS)
+# 依原判斷順序輸出 tag
+_TAG_RES = (
+    ("etf", _keyword_re(("etf",))),
+    ("regulation", _keyword_re(("sec", "regulation", "lawsuit", "policy", "ban"))),
+    ("security", _keyword_re(("hack", "exploit", "breach"))),
+    ("macro", _keyword_re(("fed", "fomc", "cpi", "inflation", "rates", "treasury"))),
+)
+
+
+# 以下三個 helper 的 text 需已轉小寫：由 _parse_rss_items 每則標題只 lower() 一次
+def _score_sentiment(text: str) -> float:
     pos = sum(1 for k in POSITIVE_KEYWORDS if k in text)
     neg = sum(1 for k in NEGATIVE_KEYWORDS if k in text)
     if pos == neg:
@@ -46,25 +63,15 @@ def _score_sentiment(title: str) -> float:
     return max(min((pos - neg) / 3.0, 1.0), -1.0)
 
 
-def _infer_tags(title: str) -> list[str]:
-    text = title.lower()
-    tags: list[str] = []
-    if "etf" in text:
-        tags.append("etf")
-    if any(k in text for k in ("sec", "regulation", "lawsuit", "policy", "ban")):
-        tags.append("regulation")
-    if any(k in text for k in ("hack", "exploit", "breach")):
-        tags.append("security")
-    if any(k in text for k in ("fed", "fomc", "cpi", "inflation", "rates", "treasury")):
-        tags.append("macro")
+def _infer_tags(text: str) -> list[str]:
+    tags = [tag for tag, pattern in _TAG_RES if pattern.search(text)]
     if not tags:
         tags.append("market")
     return tags
 
 
-def _infer_urgency(title: str) -> str:
-    text = title.lower()
-    return "high" if any(k in text for k in URGENT_KEYWORDS) else "medium"
+def _infer_urgency(text: str) -> str:
+    return "high" if _URGENT_RE.search(text) else "medium"
 
 
 def _parse_rss_items(xml_text: str, source: str) -> list[NewsItem]:
@@ -80,15 +87,16 @@ def _parse_rss_items(xml_text: str, source: str) -> list[NewsItem]:
             published_at = parsedate_to_datetime(pub_date_raw).astimezone(timezone.utc)
         except Exception:
             published_at = datetime.now(timezone.utc)
+        title_lower = title.lower()
         rows.append(
             NewsItem(
                 title=title,
                 source=source,
                 published_at=published_at,
                 link=link,
-                sentiment=_score_sentiment(title),
-                urgency=_infer_urgency(title),
-                tags=_infer_tags(title),
+                sentiment=_score_sentiment(title_lower),
+                urgency=_infer_urgency(title_lower),
+                tags=_infer_tags(title_lower),
             )
         )
     return rows
@@ -111,11 +119,18 @@ def fetch_news_context(
     ]
     urls = [f"{base}?q={quote_plus(q)}&hl=en-US&gl=US&ceid=US:en" for q in queries]
 
-    all_items: list[NewsItem] = []
-    for url in urls:
+    def _fetch(url: str) -> str:
         resp = requests.get(url, timeout=timeout_seconds)
         resp.raise_for_status()
-        all_items.extend(_parse_rss_items(resp.text, "google_news"))
+        return resp.text
+
+    # 各查詢彼此獨立：並行送出，總耗時約為最慢的一次往返；map 保留原查詢順序與例外行為
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        bodies = list(executor.map(_fetch, urls))
+
+    all_items: list[NewsItem] = []
+    for body in bodies:
+        all_items.extend(_parse_rss_items(body, "google_news"))
 
     cutoff = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
     filtered = [x for x in all_items if x.published_at >= cutoff]
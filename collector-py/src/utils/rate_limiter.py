@@ -0,0 +1,54 @@
+"""
+請求限速工具
+讓多執行緒並行送出的請求仍遵守交易所的每次請求間隔（CCXT rateLimit）
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    執行緒安全的固定間隔限速器
+
+    相鄰兩次 acquire() 放行的時間至少相隔 interval 秒；
+    預約時段在鎖內完成，實際等待在鎖外進行，不會阻塞其他執行緒預約。
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: 兩次請求之間的最小間隔（秒）
+        """
+        self.interval = max(0.0, interval)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    @classmethod
+    def for_exchange(cls, exchange) -> 'RateLimiter':
+        """依 CCXT exchange.rateLimit（毫秒/次）建立限速器"""
+        rate_limit_ms = getattr(exchange, 'rateLimit', None) or 0
+        return cls(rate_limit_ms / 1000)
+
+    @staticmethod
+    def max_workers(exchange, n_tasks: int, cap: int) -> int:
+        """
+        並行執行緒數上限：不超過 cap、任務數，也不超過 rateLimit（ms/次）換算的 QPS
+
+        Args:
+            exchange: CCXT exchange（讀取 rateLimit）
+            n_tasks: 待送出的請求數
+            cap: 呼叫端設定的最大並行數
+        """
+        rate_limit_ms = getattr(exchange, 'rateLimit', None) or 0
+        qps = int(1000 / rate_limit_ms) if rate_limit_ms > 0 else cap
+        return max(1, min(cap, n_tasks, qps))
+
+    def acquire(self) -> None:
+        """等待直到取得下一個可送出請求的時段"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
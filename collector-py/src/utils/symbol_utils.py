@@ -2,12 +2,17 @@
 Symbol 格式統一工具
 處理不同交易所的 symbol 格式轉換
 """
+from functools import lru_cache
 from typing import Tuple
 
+# 常見的 quote assets（依序比對，USDT 需排在 USD 之前）
+QUOTE_ASSETS = ('USDT', 'USDC', 'BUSD', 'USD', 'BTC', 'ETH', 'BNB', 'DAI', 'TUSD')
 
+
+@lru_cache(maxsize=4096)
 def parse_symbol(symbol: str) -> Tuple[str, str]:
     """
-    解析 symbol 成 base 和 quote asset
+    解析 symbol 成 base 和 quote asset（純函數，結果以 lru_cache 快取）
     支援格式:
     - BTC/USDT  (CCXT 標準格式)
     - BTCUSDT   (交易所原生格式)
@@ -34,9 +39,7 @@ def parse_symbol(symbol: str) -> Tuple[str, str]:
     
     # 格式 2: BTCUSDT (交易所原生)
     # 嘗試常見的 quote assets: USDT, USDC, USD, BUSD, BTC, ETH, BNB
-    quote_assets = ['USDT', 'USDC', 'BUSD', 'USD', 'BTC', 'ETH', 'BNB', 'DAI', 'TUSD']
-    
-    for quote in quote_assets:
+    for quote in QUOTE_ASSETS:
         if symbol.endswith(quote):
             base = symbol[:-len(quote)]
             if len(base) > 0:
@@ -49,6 +52,7 @@ def parse_symbol(symbol: str) -> Tuple[str, str]:
     )
 
 
+@lru_cache(maxsize=4096)
 def normalize_symbol(symbol: str) -> str:
     """
     標準化 symbol 為交易所原生格式 (無斜線)
@@ -66,6 +70,7 @@ def normalize_symbol(symbol: str) -> str:
     return symbol.replace('/', '')
 
 
+@lru_cache(maxsize=4096)
 def to_ccxt_format(symbol: str, market_type: str = 'linear') -> str:
     """
     標準化 symbol 為 CCXT 格式
@@ -0,0 +1,25 @@
+"""
+時間轉換工具
+處理交易所毫秒時間戳與 UTC datetime 之間的轉換
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def ms_to_datetime(ms: int) -> datetime:
+    """
+    毫秒時間戳 → UTC datetime（等同 datetime.fromtimestamp(ms / 1000, tz=timezone.utc)）
+
+    以 epoch + timedelta 計算，省去 fromtimestamp 的時區換算；
+    K 線 / OI / 資金費率時間戳對齊週期邊界，跨 symbol 重複率高，結果以 lru_cache 快取。
+
+    Args:
+        ms: 毫秒時間戳
+
+    Returns:
+        tz-aware UTC datetime
+    """
+    return _EPOCH + timedelta(milliseconds=ms)
@@ -87,3 +87,9 @@ def test_parse_distribution_rows_prefers_btc_total_column_over_balance_btc_range
     assert rows[0]["rank_group"] == "[0.01 - 0.1)"
     assert rows[0]["address_count"] == 8166481
     assert rows[0]["total_balance"] == 4200000.0
+
+
+def test_extract_last_updated_text_skips_pages_without_marker():
+    html = "<html><body><p>Last Updated</p><span>2024-01-02 10:00 UTC</span></body></html>"
+    assert BitInfoChartsClient._extract_last_updated_text(html) == "Last Updated: 2024-01-02 10:00 UTC"
+    assert BitInfoChartsClient._extract_last_updated_text("<html><body><table></table></body></html>") is None
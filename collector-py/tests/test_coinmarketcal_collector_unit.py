@@ -0,0 +1,75 @@
+"""
+CoinMarketCal Collector 單元測試（無網路依賴）
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from connectors._http import get_session
+from connectors.coinmarketcal_collector import CoinMarketCalCollector
+from connectors.fear_greed_collector import FearGreedIndexCollector
+
+
+def test_classify_event_type_keeps_mapping_priority():
+    collector = CoinMarketCalCollector("key", db_conn=None)
+
+    # 'launch' 排在 'mainnet' 之前，維持原本依序比對的結果
+    assert collector._classify_event_type("Mainnet launch") == "token_launch"
+    assert collector._classify_event_type("Hard fork") == "hard_fork"
+    assert collector._classify_event_type("Exchange listing") == "exchange_listing"
+    assert collector._classify_event_type("AMA") == "crypto_event"
+
+
+def test_determine_impact_by_category_and_votes():
+    collector = CoinMarketCalCollector("key", db_conn=None)
+
+    assert collector._determine_impact(0, "Halving") == "high"
+    assert collector._determine_impact(500, "AMA") == "high"
+    assert collector._determine_impact(100, "AMA") == "medium"
+    assert collector._determine_impact(10, "AMA") == "low"
+
+
+def test_save_events_serializes_event_metadata():
+    conn = MagicMock()
+    collector = CoinMarketCalCollector("key", db_conn=conn)
+    event = {
+        "id": 1,
+        "title": {"en": "Mainnet"},
+        "date_event": "2026-03-01T00:00:00Z",
+        "categories": [{"name": "Hard fork"}],
+        "coins": [{"symbol": "eth"}],
+        "vote_count": 3,
+    }
+
+    with patch("connectors.coinmarketcal_collector.execute_values") as execute_values:
+        assert collector.save_events([event]) == 1
+
+    row = execute_values.call_args.args[2][0]
+    assert row[1] == "hard_fork"
+    assert row[6] == ["ETH"]
+    assert json.loads(row[-1]) == event
+
+
+def test_collectors_share_session_without_leaking_api_key():
+    collector = CoinMarketCalCollector("secret", db_conn=None)
+
+    assert collector.session is get_session()
+    assert FearGreedIndexCollector().session is collector.session
+    assert "x-api-key" not in collector.session.headers
+    assert collector.headers["x-api-key"] == "secret"
+
+
+def test_save_events_skips_invalid_dates():
+    collector = CoinMarketCalCollector("key", db_conn=MagicMock())
+    events = [
+        {"id": 1, "title": {"en": "Bad"}, "date_event": "soon"},
+        {"id": 2, "title": {"en": "Good"}, "date_event": "2026-03-01T00:00:00Z", "coins": None},
+    ]
+
+    with patch("connectors.coinmarketcal_collector.execute_values") as execute_values:
+        assert collector.save_events(events) == 1
+
+    (row,) = execute_values.call_args.args[2]
+    assert row[2] == "Good"
+    assert row[4].tzinfo is not None
+    assert row[6] is None
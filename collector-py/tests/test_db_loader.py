@@ -264,6 +264,67 @@ class TestOHLCVOperations:
         assert count == 0
 
 
+class TestGlobalIndicatorOperations:
+    """測試 global_indicators 批次寫入"""
+
+    def test_insert_fear_greed_index_batch_single_statement(self, mock_connection_pool):
+        """測試 Fear & Greed 歷史一次送出，且同批重複 time 以最後一筆為準"""
+        from loaders.db_loader import DatabaseLoader
+
+        DatabaseLoader._connection_pool = None
+        db = DatabaseLoader()
+
+        t1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        t2 = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        data = [
+            {'timestamp': t1, 'value': 40, 'classification': 'Fear'},
+            {'timestamp': t2, 'value': 55, 'classification': 'Greed'},
+            {'timestamp': t1, 'value': 42, 'classification': 'Fear'},
+        ]
+
+        with patch('loaders.db_loader.execute_values') as mock_execute_values:
+            count = db.insert_fear_greed_index_batch(data)
+
+        assert count == 2
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args.args[2]
+        assert rows == [(t1, 42, 'Fear'), (t2, 55, 'Greed')]
+
+    def test_insert_fear_greed_index_batch_empty_data(self, mock_connection_pool):
+        """測試空資料時返回 0"""
+        from loaders.db_loader import DatabaseLoader
+
+        DatabaseLoader._connection_pool = None
+        db = DatabaseLoader()
+
+        assert db.insert_fear_greed_index_batch([]) == 0
+
+
+class TestLiquidationOperations:
+    """測試爆倉數據批次寫入"""
+
+    def test_insert_liquidations_batch_uses_execute_values(self, mock_connection_pool):
+        """測試毫秒時間戳轉為 UTC datetime，並以單一 execute_values 寫入"""
+        from loaders.db_loader import DatabaseLoader
+
+        DatabaseLoader._connection_pool = None
+        db = DatabaseLoader()
+
+        liquidations = [{
+            'time': 1704067200000, 'exchange': 'bybit', 'symbol': 'BTCUSDT',
+            'side': 'long', 'price': 42000.0, 'quantity': 0.5, 'value_usd': 21000.0,
+        }]
+
+        with patch('loaders.db_loader.execute_values') as mock_execute_values:
+            count = db.insert_liquidations_batch(liquidations)
+
+        assert count == 1
+        mock_execute_values.assert_called_once()
+        row = mock_execute_values.call_args.args[2][0]
+        assert row[0] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert mock_execute_values.call_args.kwargs['page_size'] == 1024
+
+
 class TestErrorHandling:
     """測試錯誤處理"""
     
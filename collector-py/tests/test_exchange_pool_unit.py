@@ -0,0 +1,42 @@
+"""
+ExchangePool 單元測試（無網路依賴）
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from connectors.exchange_pool import ExchangePool
+
+
+@pytest.fixture
+def pool_with_fake_exchange():
+    calls = []
+    markets = {
+        'BTC/USDT:USDT': {'type': 'swap', 'linear': True, 'quote': 'USDT'},
+        'ETH/USDC:USDC': {'type': 'swap', 'linear': True, 'quote': 'USDC'},
+        'SOL/USDT': {'type': 'spot', 'quote': 'USDT'},
+    }
+    exchange = SimpleNamespace(markets=markets, load_markets=lambda: calls.append(1))
+
+    pool = ExchangePool()
+    pool._exchanges['bybit_linear'] = exchange
+    pool._perpetuals_cache.clear()
+    yield pool, calls
+    pool._exchanges.pop('bybit_linear', None)
+    pool._perpetuals_cache.clear()
+
+
+def test_get_usdt_perpetuals_filters_and_caches(pool_with_fake_exchange):
+    pool, calls = pool_with_fake_exchange
+
+    assert pool.get_usdt_perpetuals('bybit') == ['BTCUSDT']
+    assert pool.get_usdt_perpetuals('Bybit', market_type='linear') == ['BTCUSDT']
+    assert len(calls) == 1
+
+
+def test_get_usdt_perpetuals_reloads_after_ttl(pool_with_fake_exchange):
+    pool, calls = pool_with_fake_exchange
+
+    pool.get_usdt_perpetuals('bybit', ttl=0)
+    pool.get_usdt_perpetuals('bybit', ttl=0)
+    assert len(calls) == 2
@@ -2,7 +2,10 @@
 Farside ETF Collector 單元測試（無網路依賴）
 """
 
-from unittest.mock import patch
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
 
 import connectors.farside_etf_collector as farside_mod
 from connectors.farside_etf_collector import FarsideInvestorsETFCollector
@@ -18,6 +21,20 @@ def test_parse_flow_value_normalization():
     assert collector._parse_flow_value("-") is None
 
 
+def test_parse_flow_series_matches_scalar_parser():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    values = ["(123.4)", "$45.6M", "1.2B", "987654", "-", "", None, "2 billion", "1.5k", "+5", 12.5, "abc"]
+
+    parsed = collector._parse_flow_series(pd.Series(values, dtype=object))
+
+    for raw, vectorized in zip(values, parsed):
+        expected = collector._parse_flow_value(raw)
+        if expected is None:
+            assert pd.isna(vectorized)
+        else:
+            assert vectorized == expected
+
+
 def test_parse_etf_table_with_pandas_html():
     collector = FarsideInvestorsETFCollector(use_playwright=False)
     collector.current_url = "https://farside.co.uk/btc/"
@@ -50,6 +67,10 @@ def test_parse_etf_table_with_pandas_html():
     assert all(row["schema_fingerprint"] for row in rows)
     assert all(row["fetch_method"] == "playwright" for row in rows)
 
+    recent = collector._parse_etf_table(html, "BTC", cutoff=date(2026, 2, 13))
+    assert len(recent) == 2
+    assert {row["date"] for row in recent} == {date(2026, 2, 13)}
+
 
 def test_resolve_stealth_mode_prefer_sync_api():
     with patch.object(farside_mod, "playwright_stealth_sync", object()), patch.object(
@@ -78,3 +99,222 @@ def test_apply_stealth_with_class_api():
 
     assert ok is True
     assert context["applied"] is True
+
+
+def test_is_challenge_page_scans_page_head_only():
+    challenge = "<html><head><title>Just a moment...</title></head></html>"
+    legit = "<html><head><title>Farside</title></head>" + "x" * 8000 + "/cdn-cgi/challenge-platform/scripts/jsd/main.js"
+
+    assert FarsideInvestorsETFCollector._is_challenge_page(challenge) is True
+    assert FarsideInvestorsETFCollector._is_challenge_page(legit) is False
+    assert FarsideInvestorsETFCollector._is_challenge_page("", status_code=403) is True
+    assert FarsideInvestorsETFCollector._is_challenge_bytes(challenge.encode()) is True
+    assert FarsideInvestorsETFCollector._is_challenge_bytes(legit.encode()) is False
+
+
+class _DummyStreamResponse:
+    def __init__(self, chunks, status_code=200):
+        self._chunks = chunks
+        self.status_code = status_code
+        self.encoding = "utf-8"
+        self.consumed = 0
+
+    def iter_content(self):
+        for chunk in self._chunks:
+            self.consumed += 1
+            yield chunk
+
+
+def test_read_streamed_html_aborts_on_challenge_head():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    challenge_head = b"<html><head><title>Just a moment...</title>" + b" " * 5000
+    response = _DummyStreamResponse([challenge_head, b"<p>rest</p>" * 1000, b"<p>tail</p>"])
+
+    html = collector._read_streamed_html(response)
+
+    assert collector._is_challenge_page(html) is True
+    assert response.consumed == 1
+
+
+def test_read_streamed_html_returns_full_page():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    chunks = [b"<html><head><title>Farside</title></head>", "<body>流量".encode("utf-8") + b" " * 5000, b"</body></html>"]
+
+    html = collector._read_streamed_html(_DummyStreamResponse(chunks))
+
+    assert html == b"".join(chunks).decode("utf-8")
+
+
+def test_wait_for_identity_returns_once_clearance_cookie_appears():
+    class DummyContext:
+        def __init__(self):
+            self.calls = 0
+
+        def cookies(self):
+            self.calls += 1
+            return [{"name": "cf_clearance", "value": "ok"}] if self.calls >= 3 else []
+
+    class DummyPage:
+        waits = 0
+
+        def query_selector(self, selector):
+            return None
+
+        def wait_for_timeout(self, ms):
+            self.waits += 1
+
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    page = DummyPage()
+
+    assert collector._wait_for_identity(page, DummyContext()) is True
+    assert page.waits == 2
+
+
+def test_run_collection_uses_async_prefetch_without_playwright():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.use_playwright = False
+    html = """
+    <table>
+      <thead><tr><th>Date</th><th>IBIT</th><th>FBTC</th></tr></thead>
+      <tbody>
+        <tr><td>13 Feb 2026</td><td>1.5</td><td>(2)</td></tr>
+        <tr><td>12 Feb 2026</td><td>3</td><td>4</td></tr>
+      </tbody>
+    </table>
+    """
+    db_loader = MagicMock()
+    db_loader.insert_etf_flows_batch.side_effect = lambda rows: len(rows)
+
+    with patch.object(collector, "fetch_all", return_value=[html, None]) as fetch_all, patch.object(
+        collector, "_fetch_page_with_retry", return_value=(None, "none")
+    ) as fetch_retry:
+        inserted = collector.run_collection(db_loader, days=100_000)
+
+    fetch_all.assert_called_once_with([collector.BASE_URL_BTC, collector.BASE_URL_ETH])
+    fetch_retry.assert_called_once_with(collector.BASE_URL_ETH)
+    assert inserted == 4
+    assert collector.last_fetch_method == {"BTC": "curl_cffi", "ETH": "none"}
+
+
+def test_remember_unknown_codes_is_bounded_lru():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.MAX_UNKNOWN_CODES = 3
+
+    collector._remember_unknown_codes("BTC", ["AAA", "BBB", "CCC"])
+    collector._remember_unknown_codes("BTC", ["AAA", "DDD"])
+
+    assert list(collector.last_unknown_codes["BTC"]) == ["CCC", "AAA", "DDD"]
+    assert collector.get_last_unknown_codes() == {"BTC": ["AAA", "CCC", "DDD"]}
+
+
+def test_load_identity_from_cache_uses_file_mtime(tmp_path):
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.cookie_cache_path = str(tmp_path / "etf_cookie_cache.json")
+    collector.cookie_cache_ttl_sec = 60
+    collector._save_identity_cache({"cookies": {"cf_clearance": "abc"}, "user_agent": "UA"})
+
+    assert collector._load_identity_from_cache()["cookies"] == {"cf_clearance": "abc"}
+
+    stale = farside_mod.time_module.time() - 120
+    farside_mod.os.utime(collector.cookie_cache_path, (stale, stale))
+    assert collector._load_identity_from_cache() is None
+
+
+def test_save_unchanged_identity_refreshes_cache_expiry(tmp_path):
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.cookie_cache_path = str(tmp_path / "etf_cookie_cache.json")
+    collector.cookie_cache_ttl_sec = 60
+    identity = {"cookies": {"cf_clearance": "abc"}, "user_agent": "UA"}
+    collector._save_identity_cache(identity)
+
+    stale = farside_mod.time_module.time() - 120
+    farside_mod.os.utime(collector.cookie_cache_path, (stale, stale))
+    assert collector._load_identity_from_cache() is None
+
+    # 重新取得相同身份：內容不重寫，但過期時間要跟著刷新
+    collector._save_identity_cache(dict(identity))
+    assert collector._load_identity_from_cache()["cookies"] == {"cf_clearance": "abc"}
+
+
+def test_run_collection_prefetches_with_cached_identity_in_hybrid_mode():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.use_playwright = True
+    collector.hybrid_cookie_enabled = True
+    collector._identity_cache = {"cookies": {"cf_clearance": "abc"}, "user_agent": "UA"}
+    db_loader = MagicMock()
+
+    with patch.object(collector, "fetch_all", return_value=[None, None]) as fetch_all, patch.object(
+        collector, "_fetch_page_with_retry", return_value=(None, "none")
+    ) as fetch_retry:
+        assert collector.run_collection(db_loader) == 0
+
+    fetch_all.assert_called_once()
+    assert fetch_retry.call_count == 2
+
+
+def test_persist_session_cookies_merges_into_identity_cache(tmp_path):
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.hybrid_cookie_enabled = True
+    collector.cookie_cache_path = str(tmp_path / "etf_cookie_cache.json")
+    collector.cookie_cache_ttl_sec = 60
+    collector._identity_cache = {"cookies": {"__cf_bm": "x"}, "user_agent": "UA"}
+
+    collector._persist_session_cookies({"cf_clearance": "fresh"})
+
+    cached = collector._load_identity_from_cache()
+    assert cached["cookies"] == {"__cf_bm": "x", "cf_clearance": "fresh"}
+    assert cached["user_agent"] == "UA"
+
+
+def test_fetch_with_playwright_reuses_browser_across_retries():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.use_playwright = True
+    collector.use_stealth = False
+    collector.hybrid_cookie_enabled = False
+
+    pages = ["<html>too short</html>", "<html><table>" + "<tr><td>x</td></tr>" * 400 + "</table></html>"]
+    browser = MagicMock()
+    browser.new_context.return_value.new_page.return_value.content.side_effect = pages
+    browser.new_context.return_value.new_page.return_value.goto.return_value.status = 200
+    playwright = MagicMock()
+    playwright.__enter__.return_value.chromium.launch.return_value = browser
+
+    with patch.object(farside_mod, "sync_playwright", return_value=playwright), patch.object(
+        farside_mod.time_module, "sleep"
+    ):
+        html = collector._fetch_with_playwright("https://example.com", max_retries=2)
+
+    assert html == pages[1]
+    playwright.__enter__.return_value.chromium.launch.assert_called_once()
+    assert browser.new_context.call_count == 2
+    browser.close.assert_called_once()
+
+
+def test_record_schema_change_writes_snapshot_in_background(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.current_url = "https://farside.co.uk/btc/"
+
+    collector._record_schema_change("BTC", "missing_table", "<html></html>", ["IBIT"])
+    collector._record_schema_change("BTC", "missing_table", "<html></html>", ["IBIT"])
+    collector._flush_snapshots()
+
+    snapshots = sorted(p.suffix for p in (tmp_path / "logs" / "etf_snapshots").iterdir())
+    assert snapshots == [".html", ".json"]
+
+
+def test_del_on_snapshot_worker_still_closes_session():
+    collector = FarsideInvestorsETFCollector(use_playwright=False)
+    collector.session = MagicMock()
+
+    # 最後一個參照在快照 worker 上釋放時，__del__ 不能等待自己
+    collector._snapshot_executor.submit(collector.__del__).result()
+
+    collector.session.close.assert_called_once()
+
+
+def test_parse_date_text_skips_summary_rows_without_digits():
+    with patch.object(farside_mod.pd, "to_datetime", wraps=farside_mod.pd.to_datetime) as to_datetime:
+        assert FarsideInvestorsETFCollector._parse_date_text("Average (Total)") is None
+    to_datetime.assert_not_called()
+    assert FarsideInvestorsETFCollector._parse_date_text("Feb 13, 2026") == date(2026, 2, 13)
@@ -0,0 +1,52 @@
+"""
+Fear & Greed Index Collector 單元測試（無網路依賴）
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from connectors.fear_greed_collector import FearGreedIndexCollector
+
+
+def _response(body: bytes):
+    response = MagicMock()
+    response.content = body
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_fetch_historical_parses_json_bytes():
+    collector = FearGreedIndexCollector()
+    collector.session = MagicMock()
+    collector.session.get.return_value = _response(
+        b'{"data": [{"value": "20", "timestamp": "1700000000"}, {"value": "80", "timestamp": "1699913600"}]}'
+    )
+
+    rows = collector.fetch_historical(days=2)
+
+    assert [row["value"] for row in rows] == [20, 80]
+    assert [row["classification"] for row in rows] == ["Extreme Fear", "Extreme Greed"]
+    assert rows[0]["timestamp"] == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+def test_fetch_latest_returns_none_on_invalid_json():
+    collector = FearGreedIndexCollector()
+    collector.session = MagicMock()
+    collector.session.get.return_value = _response(b"<html>bad gateway</html>")
+
+    assert collector.fetch_latest() is None
+
+
+def test_fetch_latest_reuses_value_until_upstream_update():
+    collector = FearGreedIndexCollector()
+    collector.session = MagicMock()
+    collector.session.get.return_value = _response(
+        b'{"data": [{"value": "50", "timestamp": "1700000000", "time_until_update": "3600"}]}'
+    )
+
+    first = collector.fetch_latest()
+    second = collector.fetch_latest()
+
+    assert first == second
+    assert first["classification"] == "Neutral"
+    assert collector.session.get.call_count == 1
@@ -0,0 +1,80 @@
+"""
+Funding Rate Collector 單元測試（無網路依賴）
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from connectors.funding_rate_collector import FundingRateCollector
+
+
+def _collector(rate_limit_ms):
+    collector = FundingRateCollector.__new__(FundingRateCollector)
+    collector.exchange_name = 'binance'
+    collector.market_type = 'linear'
+    collector.exchange = SimpleNamespace(rateLimit=rate_limit_ms)
+    return collector
+
+
+def test_sequential_fallback_fetches_concurrently_and_keeps_order():
+    collector = _collector(rate_limit_ms=20)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_fetch(symbol):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        if symbol == 'BADUSDT':
+            raise RuntimeError('boom')
+        return {'symbol': symbol}
+
+    collector.fetch_funding_rate = fake_fetch
+    results = collector.fetch_funding_rates_batch(['BTCUSDT', 'BADUSDT', 'ETHUSDT', 'SOLUSDT'])
+
+    assert [r['symbol'] for r in results] == ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+    assert peak > 1
+
+
+def test_bybit_batch_keeps_only_requested_symbols():
+    collector = _collector(rate_limit_ms=20)
+    collector.exchange_name = 'bybit'
+    tickers = {
+        'BTC/USDT:USDT': {'last': 100.0, 'info': {'fundingRate': '0.0001', 'markPrice': '100.5'}},
+        'DOGE/USDT:USDT': {'last': 0.1, 'info': {'fundingRate': '0.0002'}},
+        'ETH/USDT:USDT': {'last': 10.0, 'info': {}},
+    }
+    collector.exchange = SimpleNamespace(rateLimit=20, fetch_tickers=lambda params: tickers)
+
+    results = collector.fetch_funding_rates_batch(['BTC/USDT', 'ETHUSDT'])
+
+    assert [r['symbol'] for r in results] == ['BTCUSDT', 'ETHUSDT']
+    assert results[0]['funding_rate'] == 0.0001
+    assert results[0]['mark_price'] == 100.5
+    assert results[1]['funding_rate'] is None
+
+
+def test_funding_rate_history_parses_records():
+    collector = _collector(rate_limit_ms=20)
+    history = [
+        {'fundingRate': 0.0001, 'timestamp': 1704067200000, 'markPrice': 42000.0},
+        {'fundingRate': None, 'timestamp': None},
+    ]
+    collector.exchange = SimpleNamespace(
+        has={'fetchFundingRateHistory': True},
+        fetch_funding_rate_history=lambda symbol, since, limit: history,
+    )
+
+    results = collector.fetch_funding_rate_history('BTC/USDT')
+
+    assert [r['symbol'] for r in results] == ['BTCUSDT', 'BTCUSDT']
+    assert results[0]['funding_time'].isoformat() == '2024-01-01T00:00:00+00:00'
+    assert results[0]['funding_rate_daily'] == pytest.approx(0.0003)
+    assert results[1]['funding_time'] is None
+    assert 'funding_rate_daily' not in results[1]
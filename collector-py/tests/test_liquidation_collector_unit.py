@@ -0,0 +1,148 @@
+"""
+Liquidation Collector 單元測試（無網路、無資料庫依賴）
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from connectors.liquidation_collector import LiquidationCollector
+
+
+@pytest.fixture
+def collector():
+    with patch('connectors.liquidation_collector.ExchangePool'), \
+            patch('connectors.liquidation_collector.DatabaseLoader'):
+        yield LiquidationCollector()
+
+
+def test_session_mounts_retrying_pooled_adapter(collector):
+    adapter = collector.session.get_adapter('https://api.bybit.com')
+
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 2
+    assert 429 in adapter.max_retries.status_forcelist
+
+
+def test_run_collection_fetches_symbols_concurrently_in_order(collector):
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_collect(symbol):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return [] if symbol == 'XRP/USDT' else [{'symbol': symbol}]
+
+    collector.collect_bybit = fake_collect
+    collector.run_collection(['BTC/USDT', 'XRP/USDT', 'ETH/USDT'])
+
+    assert peak > 1
+    rows = collector.loader.insert_liquidations_batch.call_args.args[0]
+    assert [r['symbol'] for r in rows] == ['BTC/USDT', 'ETH/USDT']
+
+
+def test_collect_bybit_parses_response_body(collector):
+    body = (
+        b'{"retCode":0,"result":{"list":['
+        b'{"side":"Buy","size":"2","price":"100.5","time":"1704067200000"}]}}'
+    )
+    response = MagicMock(status_code=200, content=body)
+    collector.session.get = MagicMock(return_value=response)
+
+    rows = collector.collect_bybit('BTC/USDT')
+
+    assert rows == [{
+        'time': 1704067200000,
+        'exchange': 'bybit',
+        'symbol': 'BTCUSDT',
+        'side': 'short',
+        'price': 100.5,
+        'quantity': 2.0,
+        'value_usd': 201.0,
+    }]
+    assert collector.session.get.call_args.kwargs['params']['symbol'] == 'BTCUSDT'
+
+
+def _bybit_response(price):
+    body = (
+        b'{"retCode":0,"result":{"list":[{"side":"Sell","size":"1","price":"'
+        + price.encode() + b'","time":"1704067200000"}]}}'
+    )
+    return MagicMock(status_code=200, content=body)
+
+
+def test_collect_bybit_hedges_slow_primary_domain(collector):
+    collector.HEDGE_DELAY_SECONDS = 0.05
+
+    def fake_get(url, **kwargs):
+        if 'api.bybit.com' in url:
+            time.sleep(0.5)
+            return _bybit_response('1')
+        return _bybit_response('2')
+
+    collector.session.get = fake_get
+    started = time.monotonic()
+    rows = collector.collect_bybit('BTC/USDT')
+
+    assert time.monotonic() - started < 0.4
+    assert rows[0]['price'] == 2.0
+    assert rows[0]['side'] == 'long'
+
+
+def test_collect_bybit_falls_back_immediately_when_primary_fails(collector):
+    collector.HEDGE_DELAY_SECONDS = 5
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        if 'api.bybit.com' in url:
+            return MagicMock(status_code=403, content=b'')
+        return _bybit_response('3')
+
+    collector.session.get = fake_get
+    started = time.monotonic()
+    rows = collector.collect_bybit('BTC/USDT')
+
+    assert time.monotonic() - started < 1
+    assert rows[0]['price'] == 3.0
+    assert len(calls) == 2
+
+
+def test_collect_bybit_returns_empty_when_all_domains_fail(collector):
+    collector.session.get = MagicMock(side_effect=RuntimeError('down'))
+
+    assert collector.collect_bybit('BTC/USDT') == []
+    assert collector.session.get.call_count == 2
+
+
+def test_collect_bybit_falls_back_when_primary_payload_is_malformed(collector):
+    collector.HEDGE_DELAY_SECONDS = 5
+    bad = MagicMock(status_code=200, content=(
+        b'{"retCode":0,"result":{"list":['
+        b'{"side":"Buy","size":"x","price":"1","time":"1"}]}}'
+    ))
+
+    def fake_get(url, **kwargs):
+        return bad if 'api.bybit.com' in url else _bybit_response('4')
+
+    collector.session.get = fake_get
+    rows = collector.collect_bybit('BTC/USDT')
+
+    assert rows[0]['price'] == 4.0
+
+
+def test_run_collection_survives_malformed_payload_on_all_domains(collector):
+    collector.session.get = MagicMock(return_value=MagicMock(status_code=200, content=(
+        b'{"retCode":0,"result":{"list":['
+        b'{"side":"Buy","size":"x","price":"1","time":"1"}]}}'
+    )))
+
+    collector.run_collection(['BTC/USDT', 'ETH/USDT'])
+
+    collector.loader.insert_liquidations_batch.assert_not_called()
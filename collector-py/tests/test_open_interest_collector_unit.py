@@ -0,0 +1,105 @@
+"""
+Open Interest Collector 單元測試（無網路依賴）
+"""
+from types import SimpleNamespace
+
+from connectors.open_interest_collector import OpenInterestCollector
+
+
+def _collector(rate_limit_ms=20, **exchange_attrs):
+    collector = OpenInterestCollector.__new__(OpenInterestCollector)
+    collector.exchange_name = 'bybit'
+    collector.market_type = 'linear'
+    exchange_attrs.setdefault('has', {})
+    collector.exchange = SimpleNamespace(rateLimit=rate_limit_ms, **exchange_attrs)
+    return collector
+
+
+def test_batch_keeps_order_and_skips_failures():
+    collector = _collector()
+
+    def fake_fetch(symbol, price_hint=None):
+        if symbol == 'BADUSDT':
+            raise RuntimeError('boom')
+        return {'symbol': symbol}
+
+    collector.fetch_open_interest = fake_fetch
+    results = collector.fetch_open_interest_batch(['BTCUSDT', 'BADUSDT', 'ETHUSDT', 'SOLUSDT'])
+
+    assert [r['symbol'] for r in results] == ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+
+
+def test_batch_empty_symbols():
+    assert _collector().fetch_open_interest_batch([]) == []
+
+
+def test_batch_prefetches_prices_with_one_tickers_call():
+    ticker_calls = []
+
+    def fake_fetch_tickers(symbols):
+        ticker_calls.append(symbols)
+        return {'BTC/USDT:USDT': {'last': 100.0}, 'ETH/USDT:USDT': {'last': 10.0}}
+
+    def fail_fetch_ticker(symbol):
+        raise AssertionError('fetch_ticker should not be called')
+
+    collector = _collector(
+        has={'fetchTickers': True},
+        fetch_tickers=fake_fetch_tickers,
+        fetch_ticker=fail_fetch_ticker,
+        fetch_open_interest=lambda symbol: {'openInterestAmount': 2.0, 'timestamp': 1704067200000},
+    )
+
+    results = collector.fetch_open_interest_batch(['BTCUSDT', 'ETHUSDT'])
+
+    assert ticker_calls == [['BTC/USDT:USDT', 'ETH/USDT:USDT']]
+    assert [(r['symbol'], r['price'], r['open_interest_usd']) for r in results] == [
+        ('BTCUSDT', 100.0, 200.0),
+        ('ETHUSDT', 10.0, 20.0),
+    ]
+
+
+def test_fetch_open_interest_falls_back_to_ticker_without_hint():
+    collector = _collector(
+        fetch_ticker=lambda symbol: {'last': 5.0},
+        fetch_open_interest=lambda symbol: {'openInterestAmount': 3.0},
+    )
+
+    result = collector.fetch_open_interest('SOLUSDT')
+
+    assert result['price'] == 5.0
+    assert result['open_interest_usd'] == 15.0
+
+
+def test_fetch_open_interest_skips_ticker_when_usd_value_present():
+    def fail_fetch_ticker(symbol):
+        raise AssertionError('fetch_ticker should not be called')
+
+    collector = _collector(
+        fetch_ticker=fail_fetch_ticker,
+        fetch_open_interest=lambda symbol: {'openInterestAmount': 4.0, 'openInterestValue': 200.0},
+    )
+
+    result = collector.fetch_open_interest('BTCUSDT')
+
+    assert result['open_interest_usd'] == 200.0
+    assert result['price'] == 50.0
+
+
+def test_history_records_parsed_without_extra_requests():
+    history = [
+        {'openInterestAmount': 2.0, 'openInterestValue': 100.0, 'timestamp': 1704067200000},
+        {'openInterestAmount': 2.0, 'openInterestValue': None, 'timestamp': None, 'price': 7.0},
+        {'openInterestAmount': None, 'openInterestValue': None, 'timestamp': 1704067500000},
+    ]
+    collector = _collector(
+        has={'fetchOpenInterestHistory': True},
+        fetch_open_interest_history=lambda symbol, timeframe, since, limit: history,
+    )
+
+    results = collector.fetch_open_interest_history('BTC/USDT')
+
+    assert [r['symbol'] for r in results] == ['BTCUSDT'] * 3
+    assert [r['price'] for r in results] == [50.0, 7.0, None]
+    assert results[0]['timestamp'].isoformat() == '2024-01-01T00:00:00+00:00'
+    assert results[1]['timestamp'] is None
@@ -0,0 +1,46 @@
+"""
+Unit tests for the thread-safe rate limiter
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.rate_limiter import RateLimiter
+
+
+def test_acquire_spaces_calls_across_threads():
+    """測試多執行緒同時 acquire 仍依間隔放行"""
+    limiter = RateLimiter(0.02)
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.acquire()
+        with lock:
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stamps.sort()
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert min(gaps) >= 0.015
+    assert stamps[-1] - stamps[0] >= 0.075
+
+
+def test_for_exchange_uses_rate_limit_ms():
+    """測試依 CCXT rateLimit（毫秒）換算間隔，缺值時不限速"""
+    assert RateLimiter.for_exchange(SimpleNamespace(rateLimit=50)).interval == 0.05
+    assert RateLimiter.for_exchange(SimpleNamespace()).interval == 0.0
+
+
+def test_max_workers_respects_rate_limit():
+    """測試並行數受 cap、任務數與 rateLimit 換算的 QPS 限制"""
+    assert RateLimiter.max_workers(SimpleNamespace(rateLimit=20), 20, 8) == 8
+    assert RateLimiter.max_workers(SimpleNamespace(rateLimit=500), 20, 8) == 2
+    assert RateLimiter.max_workers(SimpleNamespace(rateLimit=2000), 20, 8) == 1
+    assert RateLimiter.max_workers(SimpleNamespace(rateLimit=20), 3, 8) == 3
+    assert RateLimiter.max_workers(SimpleNamespace(), 20, 8) == 8
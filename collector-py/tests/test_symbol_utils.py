@@ -199,3 +199,25 @@ class TestRoundTrip:
         ccxt = to_ccxt_format(original, market_type='spot')
         back = normalize_symbol(ccxt)
         assert back == original
+
+
+class TestMemoization:
+    """測試純函數快取"""
+
+    def test_repeated_calls_hit_cache(self):
+        """測試重複轉換同一 symbol 直接命中 lru_cache"""
+        normalize_symbol.cache_clear()
+        to_ccxt_format.cache_clear()
+
+        for _ in range(3):
+            assert normalize_symbol('BTC/USDT:USDT') == 'BTCUSDT'
+            assert to_ccxt_format('BTCUSDT', market_type='linear') == 'BTC/USDT:USDT'
+
+        assert normalize_symbol.cache_info().hits == 2
+        assert to_ccxt_format.cache_info().hits == 2
+
+    def test_invalid_symbol_still_raises_every_call(self):
+        """測試例外不會被快取"""
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                parse_symbol('INVALID')
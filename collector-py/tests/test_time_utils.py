@@ -0,0 +1,17 @@
+"""
+Unit tests for time utility functions
+"""
+from datetime import datetime, timezone
+
+from utils.time_utils import ms_to_datetime
+
+
+def test_ms_to_datetime_matches_fromtimestamp():
+    """測試與 datetime.fromtimestamp(ms / 1000, tz=utc) 結果一致"""
+    for ms in (0, 1704067200000, 1704067200123, 1893456000999):
+        assert ms_to_datetime(ms) == datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def test_ms_to_datetime_is_utc_aware():
+    """測試回傳 tz-aware UTC datetime"""
+    assert ms_to_datetime(1704067200000).tzinfo == timezone.utc